@@ -0,0 +1,54 @@
+# Scalar frcmath against the array kernels of frcmath.npmath, run from the root of the repo: python bench/bench_npmath.py
+from frctools.frcmath import math as scalar
+from frctools.frcmath import npmath
+
+import numpy as np
+import timeit
+
+
+SAMPLES = 10000
+
+
+def bench_scalar(name: str, stmt: str):
+    number = 100000
+    t = min(timeit.repeat(stmt, number=number, repeat=5, globals=globals()))
+    return t / number * 1e9
+
+
+def bench_batch(stmt: str):
+    t = min(timeit.repeat(stmt, number=10, repeat=5, globals=globals()))
+    return t / 10 * 1e6
+
+
+values = np.linspace(-10., 10., SAMPLES)
+others = values[::-1].copy()
+value_list = values.tolist()
+other_list = others.tolist()
+
+
+if __name__ == '__main__':
+    print(f'{"":<16}{"scalar":>10} | {SAMPLES} samples: loop vs npmath')
+
+    cases = [
+        ('clamp', 'scalar.clamp(0.5, -1., 1.)',
+         '[scalar.clamp(v, -1., 1.) for v in value_list]', 'npmath.clamp(values, -1., 1.)'),
+        ('deadzone', 'scalar.deadzone(0.5, 0.1)',
+         '[scalar.deadzone(v, 0.1) for v in value_list]', 'npmath.deadzone(values, 0.1)'),
+        ('repeat', 'scalar.repeat(7.5, 2.)',
+         '[scalar.repeat(v, 2.) for v in value_list]', 'npmath.repeat(values, 2.)'),
+        ('angle_normalize', 'scalar.angle_normalize(7.5)',
+         '[scalar.angle_normalize(v) for v in value_list]', 'npmath.angle_normalize(values)'),
+        ('delta_angle', 'scalar.delta_angle(0.5, 3.)',
+         '[scalar.delta_angle(a, b) for a, b in zip(value_list, other_list)]', 'npmath.delta_angle(values, others)'),
+        ('lerp_angle', 'scalar.lerp_angle(0.5, 3., 0.3)',
+         '[scalar.lerp_angle(a, b, 0.3) for a, b in zip(value_list, other_list)]', 'npmath.lerp_angle(values, others, 0.3)'),
+    ]
+
+    for name, one, loop, batch in cases:
+        print(f'{name:<16}{bench_scalar(name, one):8.0f} ns | {bench_batch(loop):8.0f} us vs {bench_batch(batch):6.0f} us')
+
+    t = np.linspace(0., 1., 1000)
+    t_list = t.tolist()
+    loop = min(timeit.repeat('[scalar.bezier((0., 0.), (1., 1.), (0., 1.), s) for s in t_list]', number=10, repeat=5, globals={**globals(), 't_list': t_list})) / 10 * 1e6
+    batch = min(timeit.repeat('npmath.bezier((0., 0.), (1., 1.), (0., 1.), t)', number=10, repeat=5, globals={**globals(), 't': t})) / 10 * 1e6
+    print(f'{"bezier":<16}{"":>10} | 1000 samples: {loop:.0f} us vs {batch:.0f} us')
@@ -0,0 +1,63 @@
+# Coroutine scheduler with 1000 coroutines, run from the root of the repo: python bench/bench_scheduler.py
+from frctools import Timer, CoroutineOrder
+
+import time
+
+
+COROUTINES = 1000
+FRAMES = 2000
+
+
+def forever():
+    while True:
+        yield None
+
+
+def short(frames: int):
+    for _ in range(frames):
+        yield None
+
+
+def sleeper():
+    while True:
+        yield from Timer.wait_for_seconds(60.)
+
+
+def run_frame():
+    Timer.do_early_coroutines()
+    Timer.do_coroutines()
+    Timer.do_late_coroutines()
+    Timer.do_allways_coroutines()
+
+
+def bench(name: str, frame):
+    best = None
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(FRAMES // 5):
+            frame()
+        elapsed = (time.perf_counter() - start) / (FRAMES // 5)
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f'{name:<40}{best * 1e6:8.1f} us/frame')
+
+
+def churn():
+    for _ in range(5):
+        Timer.start_coroutine(short(3))
+    Timer.do_coroutines()
+
+
+if __name__ == '__main__':
+    Timer.init()
+
+    for i in range(COROUTINES):
+        Timer.start_coroutine(forever(), CoroutineOrder(i % len(CoroutineOrder)))
+    bench(f'steady state, {COROUTINES} active', run_frame)
+    bench('5 short coroutines started per frame', churn)
+
+    Timer.reset()
+    for _ in range(COROUTINES):
+        Timer.start_coroutine(sleeper())
+    run_frame()
+    bench(f'{COROUTINES} sleeping', run_frame)
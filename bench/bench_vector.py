@@ -0,0 +1,26 @@
+# Microbenchmark of the scalar vectors, run from the root of the repo: python bench/bench_vector.py
+from frctools.frcmath import Vector2
+
+import timeit
+
+
+NUMBER = 200000
+
+
+def bench(name: str, stmt: str, setup: str = ''):
+    t = min(timeit.repeat(stmt, setup, number=NUMBER, repeat=5, globals=globals()))
+    print(f'{name:<18}{t / NUMBER * 1e9:8.0f} ns')
+
+
+if __name__ == '__main__':
+    setup = 'a = Vector2(1., 2.); b = Vector2(3., 4.); out = Vector2()'
+
+    bench('Vector2(x, y)', 'Vector2(1., 2.)')
+    bench('a + b', 'a + b', setup)
+    bench('a * 2.', 'a * 2.', setup)
+    bench('a.rotate(t)', 'a.rotate(0.5)', setup)
+    bench('a.normalized()', 'a.normalized()', setup)
+    bench('a.magnitude', 'a.x = 1.; a.magnitude', setup)
+    bench('a.x = v', 'a.x = 1.', setup)
+    bench('add_into', 'Vector2.add_into(out, a, b)', setup)
+    bench('rotate_inplace', 'a.rotate_inplace(0.5)', setup)
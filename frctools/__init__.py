@@ -1,10 +1,13 @@
-from .timer import Timer, CoroutineOrder, Coroutine, ConcurrentEvent
+from .timer import Timer, CoroutineOrder, Coroutine, ConcurrentEvent, FrameCache
+from .clock import Clock, MonotonicClock, FPGAClock, SimulationClock
 from .component import Component
 from .robot import RobotBase, Alliance
+from .simulation import RobotRunner
 from .servo import Servo
-from .motors import MotorGroup, WPI_CANSparkMax, WPI_CANSparkFlex, WPI_TalonFX
+from .motors import MotorGroup, WPI_CANSparkMax, WPI_CANSparkFlex, WPI_TalonFX, MotorStatusBus
 from .networktables import HarfangsDashboard
 from .led import LED
+from .profiler import Profiler, ProfilerChannel
 
 from . import drivetrain, input, frcmath, controll, sensor, devices
 
@@ -14,16 +17,25 @@ __all__ = [
     'CoroutineOrder',
     'Coroutine',
     'ConcurrentEvent',
+    'FrameCache',
+    'Clock',
+    'MonotonicClock',
+    'FPGAClock',
+    'SimulationClock',
     'Component',
     'RobotBase',
     'Alliance',
+    'RobotRunner',
     'Servo',
     'MotorGroup',
     'WPI_CANSparkMax',
     'WPI_CANSparkFlex',
     'WPI_TalonFX',
+    'MotorStatusBus',
     'HarfangsDashboard',
     'LED',
+    'Profiler',
+    'ProfilerChannel',
     'drivetrain',
     'input',
     'frcmath',
@@ -0,0 +1,36 @@
+import time
+import wpilib
+
+
+class Clock:
+    def get_time(self) -> float:
+        raise NotImplementedError()
+
+
+class MonotonicClock(Clock):
+    # Never jumps when the system clock is adjusted (NTP, RoboRIO time sync)
+    def get_time(self) -> float:
+        return time.perf_counter_ns() / 1e9
+
+
+class FPGAClock(Clock):
+    # Timestamp of the RoboRIO FPGA, also the time base of the sensors and the HAL
+    def get_time(self) -> float:
+        return wpilib.Timer.getFPGATimestamp()
+
+
+class SimulationClock(Clock):
+    # Only moves when stepped, so a simulation can run faster than real time with reproducible delta times.
+    # The time is kept in integer nanoseconds so stepping does not accumulate floating point errors.
+    def __init__(self, step_size: float = 0.02, start_time: float = 0.):
+        self.step_size = step_size
+        self.__time_ns = round(start_time * 1e9)
+
+    def get_time(self) -> float:
+        return self.__time_ns / 1e9
+
+    def set_time(self, time: float):
+        self.__time_ns = round(time * 1e9)
+
+    def step(self, dt: float = None):
+        self.__time_ns += round((self.step_size if dt is None else dt) * 1e9)
@@ -1,10 +1,15 @@
 from .pid import PID
-from .path_planning import PathPlanning
+from .path_planning import PathPlanning, PathPlanningPoint
+from .trajectory import Trajectory, TrajectoryConstraints, TrajectoryState
 from .leaky import LeakyIntegrator
 
 
 __all__ = [
     'PID',
     'PathPlanning',
+    'PathPlanningPoint',
+    'Trajectory',
+    'TrajectoryConstraints',
+    'TrajectoryState',
     'LeakyIntegrator'
 ]
@@ -1,8 +1,23 @@
 class LeakyIntegrator:
-    def __init__(self, start_value: float = 0):
+    def __init__(self, start_value: float = 0, bank=None):
         self.__current_value = start_value
 
+        # When registered in a FilterBank (of type LEAKY), the bank steps the filter and evaluate returns the output of
+        # the last bank step. That output is one step behind: it does not include this input yet.
+        if bank is not None and bank.filter_type != bank.LEAKY:
+            raise ValueError('LeakyIntegrator needs a FilterBank of type LEAKY')
+
+        self.__bank = bank
+        self.__channel = None if bank is None else bank.add_channel(0., start_value)
+
     def evaluate(self, value: float, l):
+        if self.__bank is not None:
+            self.__bank.set_parameter(self.__channel, l)
+            self.__bank.set_input(self.__channel, value)
+
+            self.__current_value = self.__bank.get(self.__channel)
+            return self.__current_value
+
         self.__current_value = l * self.__current_value + (1 - l) * value
         return self.__current_value
 
@@ -12,3 +27,5 @@ class LeakyIntegrator:
     @current.setter
     def current(self, value: float):
         self.__current_value = value
+        if self.__bank is not None:
+            self.__bank.set(self.__channel, value)
@@ -1,26 +1,89 @@
 from frctools.frcmath import Vector2, bezier, lerp_angle, inverse_lerp
+from .trajectory import Trajectory, TrajectoryConstraints, TrajectoryState
 from typing import List, Tuple
 
+from bisect import bisect_left
+
+import math
+
 
 class PathPlanningPoint:
     def __init__(self, position: Vector2, heading: float, time: float):
-        self.position = position
-        self.heading = heading
-        self.time = time
+        self.__path: 'PathPlanning' = None
+
+        # Vector2 is mutable, the point keeps its own copy so the path only changes through the setter
+        self.__position = position.copy()
+        self.__time = time
+        self.__heading = heading
+
+    @property
+    def position(self) -> Vector2:
+        return self.__position.copy()
+    @position.setter
+    def position(self, position: Vector2):
+        # Only a different position invalidates the path, an editor can assign the same position every frame
+        if position.x == self.__position.x and position.y == self.__position.y:
+            return
+
+        self.__position = position.copy()
+        self.__invalidate__()
+
+    @property
+    def heading(self) -> float:
+        return self.__heading
+    @heading.setter
+    def heading(self, heading: float):
+        if heading == self.__heading:
+            return
+
+        self.__heading = heading
+        self.__invalidate__()
+
+    @property
+    def time(self) -> float:
+        return self.__time
+    @time.setter
+    def time(self, time: float):
+        if time == self.__time:
+            return
+
+        self.__time = time
+        self.__invalidate__()
+
+    def attach(self, path: 'PathPlanning'):
+        self.__path = path
+
+    def __invalidate__(self):
+        if self.__path is not None:
+            self.__path.invalidate()
 
 
 class PathPlanning:
+    ARC_LENGTH_SAMPLES = 32
+
     def __init__(self):
         self.__points: List[PathPlanningPoint] = []
         self.__control_points: List[Vector2] = []
 
+        # Lookup tables rebuilt when the points change
+        self.__is_compiled = False
+        self.__times: List[float] = []
+        self.__arc_lengths: List[List[float]] = []
+
+        # When constraints are set, the point times are replaced by a time-optimal trajectory
+        self.__constraints: TrajectoryConstraints = None
+        self.__trajectory: Trajectory = None
+
     def get_time(self) -> float:
+        if self.__constraints is not None:
+            return self.get_trajectory().get_time()
+
         return self.__points[-1].time
 
     def get_bezier(self, index: int) -> Tuple[PathPlanningPoint, PathPlanningPoint, Vector2]:
         start = self.__points[index]
         end = self.__points[index + 1]
-        control = self.__control_points[index]
+        control = self.__control_points[index].copy()
 
         return start, end, control
 
@@ -28,7 +91,12 @@ class PathPlanning:
         return [self.get_bezier(i) for i in range(len(self.__points) - 1)]
 
     def set_beizer_control_point(self, index: int, control_point: Vector2):
-        self.__control_points[index] = control_point
+        current = self.__control_points[index]
+        if control_point.x == current.x and control_point.y == current.y:
+            return
+
+        self.__control_points[index] = control_point.copy()
+        self.invalidate()
 
     def get_point(self, index: int) -> PathPlanningPoint:
         return self.__points[index]
@@ -38,15 +106,67 @@ class PathPlanning:
 
     def add_point(self, point: PathPlanningPoint, control_point: Vector2 = None):
         self.__points.append(point)
+        point.attach(self)
 
         if len(self.__points) > 1:
             if control_point is None:
                 control_point = self.__points[-2].position + (point.position - self.__points[-2].position) / 2
-            self.__control_points.append(control_point)
+            self.__control_points.append(control_point.copy())
+
+        self.invalidate()
+
+    def set_constraints(self, constraints: TrajectoryConstraints):
+        self.__constraints = constraints
+        self.invalidate()
+
+    def get_constraints(self) -> TrajectoryConstraints:
+        return self.__constraints
+
+    def invalidate(self):
+        self.__is_compiled = False
+        self.__trajectory = None
+
+    def compile(self):
+        self.__times = [p.time for p in self.__points]
+        self.__arc_lengths = [self.__compile_arc_length__(i) for i in range(len(self.__points) - 1)]
+
+        self.__is_compiled = True
+
+        if self.__constraints is not None:
+            self.__trajectory = Trajectory(self, self.__constraints)
+
+    def get_trajectory(self) -> Trajectory:
+        if not self.__is_compiled:
+            self.compile()
+
+        return self.__trajectory
+
+    def get_trajectory_state_at(self, time: float) -> TrajectoryState:
+        return self.get_trajectory().get_state_at(time)
+
+    def get_length(self, index: int = None) -> float:
+        if not self.__is_compiled:
+            self.compile()
+
+        if index is None:
+            return sum(lengths[-1] for lengths in self.__arc_lengths)
+
+        return self.__arc_lengths[index][-1]
+
+    def get_segment_at(self, time: float) -> int:
+        if not self.__is_compiled:
+            self.compile()
+
+        # Index i such that times[i] < time <= times[i + 1]
+        return min(max(bisect_left(self.__times, time) - 1, 0), len(self.__times) - 2)
 
     def get_state_at(self, time: float) -> Tuple[Vector2, float]:
-        # If the time is less than 0, return the first point
-        if time <= 0:
+        if self.__constraints is not None:
+            state = self.get_trajectory_state_at(time)
+            return state.position, state.heading
+
+        # If the time is less than the first point, return the first point
+        if time <= 0 or time <= self.__points[0].time:
             first_point = self.__points[0]
             return first_point.position, first_point.heading
 
@@ -55,15 +175,48 @@ class PathPlanning:
             last_point = self.__points[-1]
             return last_point.position, last_point.heading
 
-        for i in range(0, len(self.__points) - 1):
-            if self.__points[i].time < time <= self.__points[i + 1].time:
-                start, end, control = self.get_bezier(i)
+        i = self.get_segment_at(time)
+        start, end, control = self.get_bezier(i)
+
+        relative_time = inverse_lerp(start.time, end.time, time)
+        t = self.get_segment_parameter(i, relative_time)
+
+        position = Vector2(*bezier(start.position, end.position, control, t))
+        heading = lerp_angle(start.heading, end.heading, relative_time)
+
+        return position, heading
+
+    def get_segment_parameter(self, index: int, fraction: float) -> float:
+        if not self.__is_compiled:
+            self.compile()
+
+        # Map a fraction of the segment length to the bezier parameter that reaches it
+        lengths = self.__arc_lengths[index]
+        total = lengths[-1]
+        if total <= 0.:
+            return fraction
+
+        target = fraction * total
+        k = bisect_left(lengths, target)
+        if k == 0:
+            return 0.
+        if k >= len(lengths):
+            return 1.
+
+        segment = lengths[k] - lengths[k - 1]
+        local = (target - lengths[k - 1]) / segment if segment > 0. else 0.
 
-                relative_time = inverse_lerp(start.time, end.time, time)
+        return (k - 1 + local) / (len(lengths) - 1)
 
-                position = Vector2(*bezier(start.position, end.position, control, relative_time))
-                heading = lerp_angle(start.heading, end.heading, relative_time)
+    def __compile_arc_length__(self, index: int) -> List[float]:
+        start, end, control = self.get_bezier(index)
+        samples = PathPlanning.ARC_LENGTH_SAMPLES
 
-                return position, heading
+        lengths = [0.]
+        last_x, last_y = start.position.x, start.position.y
+        for k in range(1, samples + 1):
+            x, y = bezier(start.position, end.position, control, k / samples)
+            lengths.append(lengths[-1] + math.hypot(x - last_x, y - last_y))
+            last_x, last_y = x, y
 
-        return None
+        return lengths
@@ -0,0 +1,191 @@
+from frctools.frcmath import Vector2, bezier, lerp, lerp_angle, delta_angle, angle_normalize
+
+from array import array
+from bisect import bisect_right
+
+import math
+
+
+class TrajectoryConstraints:
+    def __init__(self,
+                 max_velocity: float,
+                 max_acceleration: float,
+                 max_centripetal_acceleration: float = math.inf,
+                 max_angular_velocity: float = math.inf):
+        self.max_velocity = max_velocity
+        self.max_acceleration = max_acceleration
+        self.max_centripetal_acceleration = max_centripetal_acceleration
+        self.max_angular_velocity = max_angular_velocity
+
+
+class TrajectoryState:
+    __slots__ = ('time', 'position', 'heading', 'velocity', 'acceleration', 'angular_velocity')
+
+    def __init__(self, time: float, position: Vector2, heading: float, velocity: Vector2, acceleration: Vector2, angular_velocity: float):
+        self.time = time
+        self.position = position
+        self.heading = heading
+        self.velocity = velocity
+        self.acceleration = acceleration
+        self.angular_velocity = angular_velocity
+
+    def __str__(self):
+        return f'(t={self.time}, position={self.position}, heading={self.heading}, velocity={self.velocity}, acceleration={self.acceleration})'
+
+    def __repr__(self):
+        return f'TrajectoryState({str(self)})'
+
+
+class Trajectory:
+    # Columns of the sample table, each one is an array('d') indexed by sample
+    TIME = 0
+    X = 1
+    Y = 2
+    HEADING = 3
+    VX = 4
+    VY = 5
+    AX = 6
+    AY = 7
+    ANGULAR_VELOCITY = 8
+
+    def __init__(self, path, constraints: TrajectoryConstraints, sample_distance: float = 0.05):
+        self.constraints = constraints
+        self.sample_distance = sample_distance
+
+        self.__table = [array('d') for _ in range(9)]
+
+        self.__generate__(path)
+
+    def get_time(self) -> float:
+        return self.__table[Trajectory.TIME][-1]
+
+    def get_sample_count(self) -> int:
+        return len(self.__table[Trajectory.TIME])
+
+    def get_column(self, column: int) -> array:
+        return self.__table[column]
+
+    def get_state_at(self, time: float) -> TrajectoryState:
+        times = self.__table[Trajectory.TIME]
+
+        last = len(times) - 1
+
+        i = bisect_right(times, time) - 1
+        if i < 0:
+            i, j, f = 0, 0, 0.
+        elif i >= last:
+            i, j, f = last, last, 0.
+        else:
+            j = i + 1
+            f = (time - times[i]) / (times[j] - times[i])
+
+        x, y, heading, vx, vy, ax, ay, omega = self.__table[1:]
+
+        return TrajectoryState(
+            min(max(time, 0.), times[-1]),
+            Vector2(lerp(x[i], x[j], f), lerp(y[i], y[j], f)),
+            angle_normalize(heading[i] + delta_angle(heading[i], heading[j]) * f),
+            Vector2(lerp(vx[i], vx[j], f), lerp(vy[i], vy[j], f)),
+            Vector2(ax[i], ay[i]),
+            omega[i]
+        )
+
+    def __sample_path__(self, path):
+        # Dense samples along the path: (x, y, heading, tangent x, tangent y, curvature, distance to the next sample)
+        samples = []
+        for index in range(path.get_points_count() - 1):
+            start, end, control = path.get_bezier(index)
+            p0, p1, c = start.position, end.position, control
+
+            # At least two steps per segment, with a single step both ends are at rest and the segment would take no time
+            length = path.get_length(index)
+            n = max(2, math.ceil(length / self.sample_distance))
+
+            last = index == path.get_points_count() - 2
+            for k in range(n + 1 if last else n):
+                fraction = k / n
+                t = path.get_segment_parameter(index, fraction)
+
+                x, y = bezier(p0, p1, c, t)
+                heading = lerp_angle(start.heading, end.heading, fraction)
+
+                # First and second derivatives of the quadratic bezier
+                dx = 2 * (1 - t) * (c.x - p0.x) + 2 * t * (p1.x - c.x)
+                dy = 2 * (1 - t) * (c.y - p0.y) + 2 * t * (p1.y - c.y)
+                ddx = 2 * (p0.x - 2 * c.x + p1.x)
+                ddy = 2 * (p0.y - 2 * c.y + p1.y)
+
+                speed = math.hypot(dx, dy)
+                if speed > 0.:
+                    tx, ty = dx / speed, dy / speed
+                    curvature = (dx * ddy - dy * ddx) / speed ** 3
+                else:
+                    tx, ty = 0., 0.
+                    curvature = 0.
+
+                samples.append([x, y, heading, tx, ty, curvature, length / n])
+
+        return samples
+
+    def __generate__(self, path):
+        if path.get_points_count() < 2:
+            raise ValueError('A trajectory needs at least two points.')
+
+        samples = self.__sample_path__(path)
+        count = len(samples)
+        cons = self.constraints
+
+        # Velocity limit of every sample from the max velocity, the centripetal acceleration and the angular rate
+        v_max = [cons.max_velocity] * count
+        for i in range(count):
+            curvature = abs(samples[i][5])
+            if curvature > 0.:
+                v_max[i] = min(v_max[i], math.sqrt(cons.max_centripetal_acceleration / curvature))
+
+            if i < count - 1 and samples[i][6] > 0.:
+                heading_rate = abs(delta_angle(samples[i][2], samples[i + 1][2])) / samples[i][6]
+                if heading_rate > 0.:
+                    v_max[i] = min(v_max[i], cons.max_angular_velocity / heading_rate)
+
+        # The robot starts and ends at rest
+        v = v_max[:]
+        v[0] = 0.
+        v[-1] = 0.
+
+        # Forward pass, limited by the acceleration
+        for i in range(count - 1):
+            v[i + 1] = min(v[i + 1], math.sqrt(v[i] * v[i] + 2 * cons.max_acceleration * samples[i][6]))
+
+        # Backward pass, limited by the deceleration
+        for i in range(count - 2, -1, -1):
+            v[i] = min(v[i], math.sqrt(v[i + 1] * v[i + 1] + 2 * cons.max_acceleration * samples[i][6]))
+
+        times, xs, ys, headings, vxs, vys, axs, ays, omegas = self.__table
+
+        time = 0.
+        for i in range(count):
+            x, y, heading, tx, ty, curvature, ds = samples[i]
+
+            if i < count - 1 and ds > 0.:
+                accel = (v[i + 1] * v[i + 1] - v[i] * v[i]) / (2 * ds)
+                heading_rate = delta_angle(heading, samples[i + 1][2]) / ds
+                dt = 2 * ds / (v[i] + v[i + 1]) if v[i] + v[i + 1] > 0. else 0.
+            else:
+                accel = 0.
+                heading_rate = 0.
+                dt = 0.
+
+            # Tangential acceleration plus the centripetal acceleration toward the center of the curve
+            centripetal = v[i] * v[i] * curvature
+
+            times.append(time)
+            xs.append(x)
+            ys.append(y)
+            headings.append(heading)
+            vxs.append(v[i] * tx)
+            vys.append(v[i] * ty)
+            axs.append(accel * tx - centripetal * ty)
+            ays.append(accel * ty + centripetal * tx)
+            omegas.append(v[i] * heading_rate)
+
+            time += dt
@@ -1,4 +1,7 @@
 from .swerve import SwerveDriveMode, SwerveHoldAngle, SwerveModule, SwerveDrive
+from .kinematics import SwerveKinematics
+from .odometry import SwerveOdometry
+from .setpoint import SwerveSetpointGenerator
 from .sweve_calibration import SwerveCalibratorModule, SwerveCalibrator
 
 
@@ -7,6 +10,9 @@ __all__ = [
     'SwerveHoldAngle',
     'SwerveModule',
     'SwerveDrive',
+    'SwerveKinematics',
+    'SwerveOdometry',
+    'SwerveSetpointGenerator',
     'SwerveCalibratorModule',
     'SwerveCalibrator'
 ]
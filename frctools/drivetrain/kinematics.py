@@ -0,0 +1,73 @@
+from frctools.frcmath import Vector2
+
+from typing import List, Tuple
+
+
+try:
+    import numpy as np
+
+
+    class SwerveKinematics:
+        # Inverse kinematics of every module in one pass. The module positions are stored as an Nx2 array of the unit
+        # vectors the modules move along when the robot rotates, the same convention as SwerveModule.rotation_vector.
+        def __init__(self, positions: List[Vector2]):
+            self.module_count = len(positions)
+
+            rotation = np.array([(p.y, -p.x) for p in positions], dtype=np.float64).reshape(-1, 2)
+            norms = np.hypot(rotation[:, 0], rotation[:, 1])
+            norms[norms == 0.] = 1.
+
+            self.__rotation_vectors = rotation / norms[:, None]
+
+            # Preallocated buffers, stored as x and y rows so every step is a single ufunc call on contiguous memory.
+            # Every operand has the full (2, N) shape and the row views are kept: broadcasting and indexing would
+            # allocate on every call.
+            self.__rotation_rows = np.ascontiguousarray(self.__rotation_vectors.T)
+            self.__translation = np.zeros((2, self.module_count), dtype=np.float64)
+            self.__translation_x, self.__translation_y = self.__translation
+            self.__rotation = np.zeros((2, self.module_count), dtype=np.float64)
+            self.__targets = np.zeros((2, self.module_count), dtype=np.float64)
+            self.__targets_x, self.__targets_y = self.__targets
+            self.__angles = np.zeros(self.module_count, dtype=np.float64)
+            self.__speeds = np.zeros(self.module_count, dtype=np.float64)
+
+            # Returned by compute and updated in place, the values are only valid until the next call
+            self.__angle_list: List[float] = [0.] * self.module_count
+            self.__speed_list: List[float] = [0.] * self.module_count
+
+        @property
+        def rotation_vectors(self) -> 'np.ndarray':
+            return self.__rotation_vectors
+
+        def compute(self, translation: Vector2, rotation: float) -> Tuple[List[float], List[float]]:
+            # Returns the angle and speed of every module. When a module would go over full speed, every module is
+            # scaled down by the same factor so the robot still moves in the commanded direction.
+            # The same two lists are returned on every call, copy them to keep the values.
+            self.__translation_x.fill(translation.x)
+            self.__translation_y.fill(translation.y)
+            self.__rotation.fill(rotation)
+
+            targets = np.multiply(self.__rotation_rows, self.__rotation, out=self.__targets)
+            np.add(targets, self.__translation, out=targets)
+
+            speeds = np.hypot(self.__targets_x, self.__targets_y, out=self.__speeds)
+            angles = np.arctan2(self.__targets_y, self.__targets_x, out=self.__angles)
+
+            # Few modules, the copy and the desaturation are cheaper on the lists than with more ufunc calls
+            angle_list = self.__angle_list
+            speed_list = self.__speed_list
+            for i in range(self.module_count):
+                angle_list[i] = angles.item(i)
+                speed_list[i] = speeds.item(i)
+
+            max_speed = max(speed_list)
+            if max_speed > 1.:
+                for i in range(self.module_count):
+                    speed_list[i] /= max_speed
+
+            return angle_list, speed_list
+
+except ImportError:
+    class SwerveKinematics:
+        def __init__(self, *args, **kwargs):
+            raise ImportError('numpy is not installed')
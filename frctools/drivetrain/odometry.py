@@ -0,0 +1,166 @@
+from frctools import Component, Timer
+from frctools.frcmath import Pose2, lerp, delta_angle, angle_normalize
+
+from array import array
+from typing import List
+
+import math
+import wpiutil
+
+
+try:
+    import numpy as np
+
+
+    class SwerveOdometry(Component):
+        # Integrates the module displacements every loop, the heading comes from the gyro of the swerve.
+        # The last history_size poses are kept with their time so a delayed vision measurement can be applied
+        # to the pose the robot had when the image was taken, then carried forward to the current pose.
+        def __init__(self, swerve, start_pose: Pose2 = None, history_size: int = 50, use_gyro: bool = True):
+            super().__init__()
+
+            self.swerve = swerve
+            self.use_gyro = use_gyro
+
+            # Least squares forward kinematics, computed once: [vx, vy, omega] = solve @ [dx0, dy0, dx1, dy1, ...]
+            # A module at (x, y) moves by (vx - omega * y, vy + omega * x).
+            rows = []
+            for mod in swerve.modules:
+                rows.append((1., 0., -mod.position.y))
+                rows.append((0., 1., mod.position.x))
+            self.__solve = np.linalg.pinv(np.array(rows, dtype=np.float64))
+            self.__displacements = np.zeros(2 * len(swerve.modules), dtype=np.float64)
+
+            self.__last_distances: List[float] = [mod.get_drive_position() for mod in swerve.modules]
+            self.__last_heading = swerve.get_heading()
+
+            self.__pose = Pose2.identity() if start_pose is None else start_pose
+
+            # Ring buffer of the past poses, one column per field
+            self.__history_time = array('d', bytes(8 * history_size))
+            self.__history_x = array('d', bytes(8 * history_size))
+            self.__history_y = array('d', bytes(8 * history_size))
+            self.__history_theta = array('d', bytes(8 * history_size))
+            self.__history_index = 0
+            self.__history_count = 0
+
+        def update(self):
+            self.__integrate__()
+
+        def update_disabled(self):
+            self.__integrate__()
+
+        def get_pose(self) -> Pose2:
+            return self.__pose
+
+        def reset_pose(self, pose: Pose2):
+            self.__pose = pose
+            self.__last_heading = self.swerve.get_heading()
+            self.__history_count = 0
+
+        def get_pose_at(self, time: float) -> Pose2:
+            # Interpolated between the two samples around the time, clamped to the oldest and newest samples
+            count = self.__history_count
+            if count == 0:
+                return self.__pose
+
+            size = len(self.__history_time)
+            newer = (self.__history_index - 1) % size
+            if time >= self.__history_time[newer]:
+                return self.__get_sample__(newer)
+
+            for _ in range(count - 1):
+                older = (newer - 1) % size
+                if self.__history_time[older] <= time:
+                    t0, t1 = self.__history_time[older], self.__history_time[newer]
+                    f = (time - t0) / (t1 - t0) if t1 > t0 else 1.
+
+                    return Pose2(lerp(self.__history_x[older], self.__history_x[newer], f),
+                                 lerp(self.__history_y[older], self.__history_y[newer], f),
+                                 self.__blend_angle__(self.__history_theta[older], self.__history_theta[newer], f))
+                newer = older
+
+            return self.__get_sample__(newer)
+
+        def add_vision_measurement(self, pose: Pose2, timestamp: float, trust: float = 1.):
+            # trust is the weight of the measurement against odometry, between 0 and 1
+            past = self.get_pose_at(timestamp)
+            corrected = Pose2(lerp(past.x, pose.x, trust),
+                              lerp(past.y, pose.y, trust),
+                              self.__blend_angle__(past.theta, pose.theta, trust))
+
+            # Moves the current pose and the poses recorded after the measurement by the same correction
+            correction = corrected * past.inverse
+            self.__pose = correction * self.__pose
+
+            size = len(self.__history_time)
+            for k in range(self.__history_count):
+                i = (self.__history_index - 1 - k) % size
+                if self.__history_time[i] < timestamp:
+                    break
+
+                sample = correction * self.__get_sample__(i)
+                self.__history_x[i] = sample.x
+                self.__history_y[i] = sample.y
+                self.__history_theta[i] = sample.theta
+
+        def __integrate__(self):
+            displacements = self.__displacements
+            for i, mod in enumerate(self.swerve.modules):
+                distance = mod.get_drive_position()
+                delta = distance - self.__last_distances[i]
+                self.__last_distances[i] = distance
+
+                angle = mod.get_steer_angle()
+                displacements[2 * i] = delta * math.cos(angle)
+                displacements[2 * i + 1] = delta * math.sin(angle)
+
+            dx, dy, dtheta = (self.__solve @ displacements).tolist()
+
+            heading = self.swerve.get_heading()
+            if self.use_gyro:
+                dtheta = delta_angle(self.__last_heading, heading)
+            self.__last_heading = heading
+
+            self.__pose = self.__pose * self.__twist__(dx, dy, dtheta)
+            self.__record__(Timer.get_current_time(), self.__pose)
+
+        @staticmethod
+        def __blend_angle__(a: float, b: float, t: float) -> float:
+            # Along the shortest arc, a plain lerp between 3.1 and -3.1 would go through 0
+            return angle_normalize(a + delta_angle(a, b) * t)
+
+        @staticmethod
+        def __twist__(dx: float, dy: float, dtheta: float) -> Pose2:
+            # Exponential map, the robot moves along an arc while it turns
+            if abs(dtheta) < 1e-9:
+                s = 1. - dtheta * dtheta / 6.
+                c = dtheta / 2.
+            else:
+                s = math.sin(dtheta) / dtheta
+                c = (1. - math.cos(dtheta)) / dtheta
+
+            return Pose2(dx * s - dy * c, dx * c + dy * s, dtheta)
+
+        def __record__(self, time: float, pose: Pose2):
+            i = self.__history_index
+            self.__history_time[i] = time
+            self.__history_x[i] = pose.x
+            self.__history_y[i] = pose.y
+            self.__history_theta[i] = pose.theta
+
+            self.__history_index = (i + 1) % len(self.__history_time)
+            self.__history_count = min(self.__history_count + 1, len(self.__history_time))
+
+        def __get_sample__(self, i: int) -> Pose2:
+            return Pose2(self.__history_x[i], self.__history_y[i], self.__history_theta[i])
+
+        def initSendable(self, builder: wpiutil.SendableBuilder):
+            builder.addDoubleProperty('x', lambda: self.__pose.x, lambda v: None)
+            builder.addDoubleProperty('y', lambda: self.__pose.y, lambda v: None)
+            builder.addDoubleProperty('theta', lambda: self.__pose.theta, lambda v: None)
+
+except ImportError:
+    class SwerveOdometry:
+        def __init__(self, *args, **kwargs):
+            raise ImportError('numpy is not installed')
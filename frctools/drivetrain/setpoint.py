@@ -0,0 +1,90 @@
+from frctools.frcmath import delta_angle, angle_normalize
+
+from typing import List, Tuple
+
+import math
+
+
+class SwerveSetpointGenerator:
+    # Sits between the kinematics and the modules, turns the target (angle, speed) of every module into a setpoint
+    # the module can follow this loop:
+    #   - the wheel either rotates to the target or flips its drive direction, whichever needs less steering time
+    #   - the steering angle moves at most max_steering_rate (rad/s) toward the target
+    #   - the drive is scaled by the cosine of the steering error so a wheel does not push sideways
+    #   - the drive changes by at most max_drive_acceleration (units/s), the same fraction of the change is applied
+    #     to every module so the robot keeps the commanded direction while accelerating
+    def __init__(self, max_steering_rate: float, max_drive_acceleration: float, flip_margin: float = 0.1):
+        self.max_steering_rate = max_steering_rate
+        self.max_drive_acceleration = max_drive_acceleration
+
+        # Extra steering (rad) a flip must save before being chosen, avoids chattering around 90 degrees
+        self.flip_margin = flip_margin
+
+        # Updated in place by generate, the lists returned by generate are only valid until the next call
+        self.__angles: List[float] = None
+        self.__drives: List[float] = None
+        self.__targets: List[float] = None
+
+    def reset(self, angles: List[float]):
+        self.__angles = list(angles)
+        self.__drives = [0.] * len(angles)
+        self.__targets = [0.] * len(angles)
+
+    def get_angles(self) -> List[float]:
+        return self.__angles
+
+    def get_drives(self) -> List[float]:
+        return self.__drives
+
+    def generate(self, angles: List[float], speeds: List[float], dt: float) -> Tuple[List[float], List[float]]:
+        if self.__angles is None:
+            self.reset(angles)
+
+        current_angles = self.__angles
+        drives = self.__drives
+        targets = self.__targets
+
+        max_steer = self.max_steering_rate * dt
+
+        # The module needing the largest drive change, see the acceleration limit below
+        largest = 0.
+
+        for i in range(len(current_angles)):
+            speed = speeds[i]
+
+            # Stopped wheels keep their angle
+            if speed <= 0.01:
+                targets[i] = 0.
+            else:
+                current = current_angles[i]
+                target_angle = angles[i]
+
+                # A wheel driving backward points the other way, keep the current drive direction unless flipping is faster
+                direction = 1. if drives[i] >= 0. else -1.
+                keep_error = delta_angle(current, target_angle if direction > 0 else target_angle + math.pi)
+                flip_error = delta_angle(current, target_angle + math.pi if direction > 0 else target_angle)
+
+                if abs(flip_error) + self.flip_margin < abs(keep_error):
+                    direction = -direction
+                    error = flip_error
+                else:
+                    error = keep_error
+
+                step = max_steer if error > max_steer else -max_steer if error < -max_steer else error
+                current_angles[i] = angle_normalize(current + step)
+
+                cos_error = math.cos(error - step)
+                targets[i] = direction * speed * cos_error if cos_error > 0. else 0.
+
+            change = abs(targets[i] - drives[i])
+            if change > largest:
+                largest = change
+
+        # Joint acceleration limit, the module needing the largest change sets the fraction applied to all of them
+        max_change = self.max_drive_acceleration * dt
+        fraction = 1. if largest <= max_change else max_change / largest
+
+        for i in range(len(drives)):
+            drives[i] += (targets[i] - drives[i]) * fraction
+
+        return current_angles, drives
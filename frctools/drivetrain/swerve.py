@@ -2,7 +2,9 @@ from wpimath.geometry import Rotation3d, Rotation2d
 
 from frctools import Component, Coroutine, CoroutineOrder, Timer
 from frctools.input import Input
-from frctools.frcmath import Vector2, Polar, repeat, lerp, angle_normalize, delta_angle
+from .kinematics import SwerveKinematics
+from .setpoint import SwerveSetpointGenerator
+from frctools.frcmath import Vector2, repeat, lerp, angle_normalize, delta_angle
 
 
 from wpimath.kinematics import SwerveDrive4Kinematics, SwerveModulePosition
@@ -12,7 +14,7 @@ import wpilib
 import wpiutil
 
 
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from enum import Enum
 
 
@@ -29,6 +31,9 @@ class SwerveHoldAngle:
         self.__target = 0
         self.__is_running = False
 
+        self.__current_vec = Vector2()
+        self.__target_vec = Vector2()
+
     def set_target(self, target):
         self.__target = target
 
@@ -44,8 +49,8 @@ class SwerveHoldAngle:
     def __control_loop__(self):
         while True:
             if self.__is_running:
-                current = Vector2(0, 1).rotate(self.__swerve.get_heading())
-                target = Vector2(0, 1).rotate(self.__target)
+                current = self.__current_vec.set(0., 1.).rotate_inplace(self.__swerve.get_heading())
+                target = self.__target_vec.set(0., 1.).rotate_inplace(self.__target)
 
                 error = current.dot(target)
                 self.__swerve.override_axes(horzontal=self.__controller.evaluate(error))
@@ -67,6 +72,9 @@ class SwerveModule:
 
         self.drive_motor = drive_motor
 
+        # Float position of the drive motor, WPI_TalonFX keeps get_position for its phoenix6 status signal
+        self.__drive_position = getattr(drive_motor, 'get_position_value', None) or getattr(drive_motor, 'get_position', None)
+
         self.steering_motor = steering_motor
         self.steering_encoder = steering_encoder
         self.steering_controller = steering_controller
@@ -82,19 +90,68 @@ class SwerveModule:
         self.__rotation: float = 0.
 
         self.__target_vec = Vector2.zero()
+        self.__target_angle = 0.
+        self.__target_speed = 0.
 
         self.__last_flip = 1
         self.__last_flip_frame = 0
 
+        # Onboard closed loop, the motor controllers run the loops and only receive setpoints
+        self.__onboard_steering = False
+        self.__onboard_drive_velocity: float = None
+
     def init(self):
         pass
 
+    def enable_onboard_control(self,
+                               steering_pid: Tuple[float, float, float],
+                               drive_pid: Tuple[float, float, float, float] = None,
+                               max_drive_velocity: float = 1.,
+                               **steering_sensor):
+        # The steering position loop runs on the steering motor, its absolute sensor must read the same value as the
+        # steering encoder, the steering offset is pushed in the device config.
+        # When drive_pid (p, i, d, ff) is given, the drive speed is sent as a velocity setpoint of max_drive_velocity
+        # at full speed, in the velocity unit of the drive motor.
+        # steering_sensor is passed to set_position_control (sensor_inverted, cancoder_id)
+        self.steering_motor.set_position_control(*steering_pid, offset=self.steering_offset, **steering_sensor)
+        self.__onboard_steering = True
+
+        if drive_pid is not None:
+            self.drive_motor.set_velocity_control(*drive_pid)
+            self.__onboard_drive_velocity = max_drive_velocity
+        else:
+            self.__onboard_drive_velocity = None
+
+    def disable_onboard_control(self):
+        # The next duty cycle sent to the motors takes them out of their closed loop
+        self.__onboard_steering = False
+        self.__onboard_drive_velocity = None
+
+    def is_onboard_control(self) -> bool:
+        return self.__onboard_steering
+
     def update(self, translation: Vector2, rotation: float):
-        self.__translation = translation
+        self.__translation.set(translation.x, translation.y)
         self.__rotation = rotation
 
         self.__compute_vectors__()
-        self.__controll_module__()
+        self.__controll_module__(math.atan2(self.__target_vec.y, self.__target_vec.x), self.__target_vec.magnitude)
+
+    def set_target(self, angle: float, speed: float):
+        # Target computed by SwerveKinematics, the speed is between 0 and 1 and scaled by the module speed
+        self.__controll_module__(angle, speed * self.speed)
+
+    def set_setpoint(self, angle: float, drive: float):
+        # Setpoint from a SwerveSetpointGenerator, the flip and the rate limits are already applied
+        self.__target_angle = angle
+        self.__target_speed = abs(drive)
+
+        left_dot = math.sin(angle - self.get_steer_angle())
+
+        if self.cosine_compensation:
+            drive *= 1 - abs(left_dot)
+
+        self.__apply_module__(angle, left_dot, drive)
 
     def set_axes(self, horizontal: float = None, vertical: float = None, rotation: float = None):
         self.set_horizontal(horizontal)
@@ -121,20 +178,23 @@ class SwerveModule:
 
     def __compute_vectors__(self):
         # Compute the translation and rotation vectors
-        rot = self.rotation_vector * self.__rotation
+        target_vec = Vector2.scale_into(self.__target_vec, self.rotation_vector, self.__rotation)
 
         # Normalize if the vector is greater than one
-        sum_vec = self.__translation + rot
-        if sum_vec.magnitude > 1:
-            sum_vec.normalize()
+        Vector2.add_into(target_vec, self.__translation, target_vec)
+        if target_vec.magnitude > 1:
+            target_vec.normalize()
 
-        self.__target_vec = sum_vec * self.speed
+        Vector2.scale_into(target_vec, target_vec, self.speed)
 
-        self.__translation = Vector2.zero()
+        self.__translation.set(0., 0.)
         self.__rotation = 0
 
-    def __controll_module__(self):
-        if self.__target_vec.magnitude <= 0.01:
+    def __controll_module__(self, target_angle: float, drive: float):
+        self.__target_angle = target_angle
+        self.__target_speed = drive
+
+        if drive <= 0.01:
             self.drive_motor.set(0)
             self.steering_motor.set(0)
 
@@ -143,24 +203,12 @@ class SwerveModule:
 
             return
 
-        # Get the drive motor speed
-        drive = self.__target_vec.magnitude
-
-        # Get the forward vector for the module
-        forward = Polar(self.get_steer_angle(), 1)
-
-        # Convert the vector from polar from to cartesian
-        forward_vec = forward.to_vector()
-        left_vec = forward_vec.rotate(math.pi / 2)
-
-        # Get the normalized target vector
-        target_norm = self.__target_vec.normalized()
-        target_norm *= self.__last_flip
         drive *= self.__last_flip
 
-        # Project the target vector onto the forward and left
-        forward_dot = forward_vec.dot(target_norm)
-        left_dot = left_vec.dot(target_norm)
+        # Project the (flipped) target direction onto the forward and left vectors of the module
+        delta = target_angle - self.get_steer_angle()
+        forward_dot = math.cos(delta) * self.__last_flip
+        left_dot = math.sin(delta) * self.__last_flip
         curr_frame = Timer.get_frame_count()
 
         # If the projection on the forward vector is negative. It is faster to flip the drive motor
@@ -170,16 +218,31 @@ class SwerveModule:
             self.__last_flip *= -1
             self.__last_flip_frame = curr_frame
 
-        # Evaluate the output of the steering pid controller
-        steering = self.steering_controller.evaluate(left_dot)
-
         if self.cosine_compensation:
             drive *= 1 - abs(left_dot)
 
+        # A flipped module points the other way
+        if self.__last_flip < 0:
+            target_angle += math.pi
+
+        self.__apply_module__(target_angle, left_dot, drive)
+
+    def __apply_module__(self, angle: float, left_dot: float, drive: float):
         # Apply the command to the motors
-        #self.steering_motor.set_voltage(steering)
-        self.steering_motor.set(steering)
-        self.drive_motor.set(drive)
+        if self.__onboard_steering:
+            # Inverse of get_steer_angle, in rotations of the steering encoder after the offset
+            self.steering_motor.set_position_target(((math.pi - angle) / (2 * math.pi)) % 1.)
+        else:
+            # Evaluate the output of the steering pid controller
+            steering = self.steering_controller.evaluate(left_dot)
+
+            #self.steering_motor.set_voltage(steering)
+            self.steering_motor.set(steering)
+
+        if self.__onboard_drive_velocity is not None:
+            self.drive_motor.set_velocity_target(drive * self.__onboard_drive_velocity)
+        else:
+            self.drive_motor.set(drive)
 
     def get_stee_rangle_raw(self):
         return self.steering_encoder.get()
@@ -189,14 +252,17 @@ class SwerveModule:
         return lerp(math.pi, -math.pi, encoder)
 
     def get_steer_target_angle(self) -> float:
-        if self.__target_vec.magnitude < 0.01:
+        if self.__target_speed < 0.01:
             return 0
 
-        return math.atan2(self.__target_vec.y, self.__target_vec.x)
+        return self.__target_angle
 
     def get_drive_velocity(self) -> float:
         return self.drive_motor.get()
 
+    def get_drive_position(self) -> float:
+        return self.__drive_position()
+
     def get_instant_vector_raw(self) -> Vector2:
         angle = self.get_steer_angle()
         vel = self.get_drive_velocity()
@@ -205,7 +271,7 @@ class SwerveModule:
                        vel * math.sin(angle))
 
     def get_module_position(self) -> SwerveModulePosition:
-        return SwerveModulePosition(self.drive_motor.get_position(), self.get_steer_angle())
+        return SwerveModulePosition(self.get_drive_position(), self.get_steer_angle())
 
 
 class SwerveDrive(Component):
@@ -235,16 +301,29 @@ class SwerveDrive(Component):
         self.__translation: Vector2 = Vector2()
         self.__rotation: float = 0.
 
+        # Without numpy the modules compute their own target, normalized one by one
+        try:
+            self.kinematics = SwerveKinematics([mod.position for mod in modules])
+        except ImportError:
+            self.kinematics = None
+        self.__kinematics4: SwerveDrive4Kinematics = None
+
+        # Optional rate limiting stage between the kinematics and the modules, see set_setpoint_generator
+        self.setpoint_generator: SwerveSetpointGenerator = None
+
         self.__control_coroutine = None
 
     def init(self):
         for mod in self.modules:
             mod.init()
 
+        if self.setpoint_generator is not None:
+            self.setpoint_generator.reset([mod.get_steer_angle() for mod in self.modules])
+
     def update(self):
         self.__control_coroutine = Timer.start_coroutine_if_stopped(self.__control_loop__, self.__control_coroutine, CoroutineOrder.LATE)
 
-        self.__translation = Vector2(self.horizontal.get(), self.vertical.get())
+        self.__translation.set(self.horizontal.get(), self.vertical.get())
         self.__rotation = self.rotation.get()
 
     def __control_loop__(self):
@@ -266,13 +345,35 @@ class SwerveDrive(Component):
 
     def __update_centric__(self, use_heading: bool):
         if use_heading:
-            self.__translation = self.__translation.rotate(self.get_heading())
+            self.__translation.rotate_inplace(self.get_heading())
+        else:
+            self.__translation.rotate_inplace(self.local_offset)
+
+        if self.kinematics is None:
+            for mod in self.modules:
+                mod.update(self.__translation,
+                           self.__rotation)
+        elif self.setpoint_generator is not None:
+            angles, speeds = self.kinematics.compute(self.__translation, self.__rotation)
+            for i, mod in enumerate(self.modules):
+                speeds[i] *= mod.speed
+
+            angles, drives = self.setpoint_generator.generate(angles, speeds, Timer.get_delta_time())
+            for mod, angle, drive in zip(self.modules, angles, drives):
+                mod.set_setpoint(angle, drive)
         else:
-            self.__translation = self.__translation.rotate(self.local_offset)
+            angles, speeds = self.kinematics.compute(self.__translation, self.__rotation)
+            for mod, angle, speed in zip(self.modules, angles, speeds):
+                mod.set_target(angle, speed)
 
-        for mod in self.modules:
-            mod.update(self.__translation,
-                       self.__rotation)
+    def set_setpoint_generator(self, generator: SwerveSetpointGenerator):
+        # Needs numpy, the setpoints are generated from the output of SwerveKinematics
+        if generator is not None and self.kinematics is None:
+            raise ImportError('numpy is not installed')
+
+        self.setpoint_generator = generator
+        if generator is not None:
+            generator.reset([mod.get_steer_angle() for mod in self.modules])
 
     def set_speed(self, speed: float):
         for mod in self.modules:
@@ -282,6 +383,25 @@ class SwerveDrive(Component):
         for mod in self.modules:
             mod.set_cosine_compensation(cosine_compensation)
 
+    def enable_onboard_control(self,
+                               steering_pid: Tuple[float, float, float],
+                               drive_pid: Tuple[float, float, float, float] = None,
+                               max_drive_velocity: float = 1.,
+                               steering_sensors: List[Dict] = None):
+        # steering_sensors holds the sensor options of every module, in the order of the modules,
+        # e.g. [{'cancoder_id': 10}, {'cancoder_id': 11, 'sensor_inverted': True}, ...] for TalonFX steering motors
+        if steering_sensors is None:
+            steering_sensors = [{}] * len(self.modules)
+        elif len(steering_sensors) != len(self.modules):
+            raise ValueError('steering_sensors needs one entry per module')
+
+        for mod, sensor in zip(self.modules, steering_sensors):
+            mod.enable_onboard_control(steering_pid, drive_pid, max_drive_velocity, **sensor)
+
+    def disable_onboard_control(self):
+        for mod in self.modules:
+            mod.disable_onboard_control()
+
     def set_drive_mode(self, mode:  SwerveDriveMode):
         self.drive_mode = mode
 
@@ -301,14 +421,16 @@ class SwerveDrive(Component):
         self.local_offset = offset
 
     def get_swerve_4kinematics(self):
-        kinematics = SwerveDrive4Kinematics(
-            self.modules[0].position.to_translation2d(),
-            self.modules[1].position.to_translation2d(),
-            self.modules[2].position.to_translation2d(),
-            self.modules[3].position.to_translation2d()
-        )
-
-        return kinematics
+        # The module positions do not change, the kinematics are only built once
+        if self.__kinematics4 is None:
+            self.__kinematics4 = SwerveDrive4Kinematics(
+                self.modules[0].position.to_translation2d(),
+                self.modules[1].position.to_translation2d(),
+                self.modules[2].position.to_translation2d(),
+                self.modules[3].position.to_translation2d()
+            )
+
+        return self.__kinematics4
 
     def get_gyro_angle2d(self) -> Rotation2d:
         return Rotation2d.fromDegrees(self.imu.getAngle())
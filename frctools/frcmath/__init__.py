@@ -17,9 +17,13 @@ from .vector import (Range,
                      Vector3,
                      Vector4,
                      Quaternion,
+                     VectorPool,
                      Polar)
+from .vector_array import Vector2Array, Vector3Array
+from .pose import Pose2, Pose3
 from .average import MovingAverage
 from .filter import SlewRateLimiter
+from .filter_bank import FilterBank
 
 
 __all__ = [
@@ -42,7 +46,13 @@ __all__ = [
     'Vector3',
     'Vector4',
     'Quaternion',
+    'VectorPool',
     'Polar',
+    'Vector2Array',
+    'Vector3Array',
+    'Pose2',
+    'Pose3',
     'MovingAverage',
-    'SlewRateLimiter'
+    'SlewRateLimiter',
+    'FilterBank'
 ]
@@ -1,23 +1,169 @@
-from statistics import mean
+from array import array
+from bisect import bisect_left, insort
+from collections import deque
+
+import math
 
 
 class MovingAverage:
-    def __init__(self, max_size):
+    MEAN_MODE = 0
+    MEDIAN_MODE = 1
+
+    def __init__(self, max_size, mode: int = 0, track_variance: bool = False, track_min_max: bool = False):
         self.__max_size = max_size
-        self.__queue = []
+        self.__mode = mode
+
+        self.__track_variance = track_variance
+        self.__track_min_max = track_min_max
+
+        # Ring buffer of the last max_size values
+        self.__buffer = array('d', bytes(8 * max_size))
+        self.__index = 0
+        self.__count = 0
+
+        self.__sum = 0.
+        self.__sqr_sum = 0.
+
+        # Monotonic deques of (sample number, value), the front is the current min / max
+        self.__sample = 0
+        self.__min_queue = deque()
+        self.__max_queue = deque()
+
+        # Sorted copy of the window, only kept for the median mode
+        self.__sorted = []
 
         self.__last_avg = 0
 
     def evaluate(self, new_val):
-        self.__queue.append(new_val)
-        if len(self.__queue) > self.__max_size:
-            self.__queue.pop(0)
+        new_val = float(new_val)
+
+        if self.__count == self.__max_size:
+            old_val = self.__buffer[self.__index]
+            self.__sum -= old_val
+            if self.__track_variance:
+                self.__sqr_sum -= old_val * old_val
+            if self.__mode == MovingAverage.MEDIAN_MODE:
+                del self.__sorted[bisect_left(self.__sorted, old_val)]
+        else:
+            self.__count += 1
+
+        self.__buffer[self.__index] = new_val
+        self.__sum += new_val
+        if self.__track_variance:
+            self.__sqr_sum += new_val * new_val
+        if self.__mode == MovingAverage.MEDIAN_MODE:
+            insort(self.__sorted, new_val)
+        if self.__track_min_max:
+            self.__push_min_max__(new_val)
+
+        self.__index += 1
+        if self.__index == self.__max_size:
+            self.__index = 0
+            self.__resync__()
+
+        if self.__mode == MovingAverage.MEDIAN_MODE:
+            self.__last_avg = self.get_median()
+        else:
+            self.__last_avg = self.__sum / self.__count
 
-        self.__last_avg = mean(self.__queue)
         return self.__last_avg
 
     def get(self):
         return self.__last_avg
 
+    def get_mean(self) -> float:
+        if self.__count == 0:
+            return 0.
+
+        return self.__sum / self.__count
+
+    def get_median(self) -> float:
+        if self.__count == 0:
+            return 0.
+
+        if self.__mode == MovingAverage.MEDIAN_MODE:
+            values = self.__sorted
+        else:
+            values = sorted(self.__window__())
+
+        mid = self.__count // 2
+        if self.__count % 2 == 1:
+            return values[mid]
+
+        return (values[mid - 1] + values[mid]) / 2
+
+    def get_variance(self) -> float:
+        if not self.__track_variance:
+            raise ValueError('Variance is not tracked by this moving average.')
+        if self.__count == 0:
+            return 0.
+
+        mean = self.__sum / self.__count
+        return max(self.__sqr_sum / self.__count - mean * mean, 0.)
+
+    def get_std(self) -> float:
+        return math.sqrt(self.get_variance())
+
+    def get_min(self) -> float:
+        if not self.__track_min_max:
+            raise ValueError('Min / Max are not tracked by this moving average.')
+        if self.__count == 0:
+            return 0.
+
+        return self.__min_queue[0][1]
+
+    def get_max(self) -> float:
+        if not self.__track_min_max:
+            raise ValueError('Min / Max are not tracked by this moving average.')
+        if self.__count == 0:
+            return 0.
+
+        return self.__max_queue[0][1]
+
+    def get_count(self) -> int:
+        return self.__count
+
     def clear(self):
-        self.__queue.clear()
+        self.__index = 0
+        self.__count = 0
+
+        self.__sum = 0.
+        self.__sqr_sum = 0.
+
+        self.__sample = 0
+        self.__min_queue.clear()
+        self.__max_queue.clear()
+
+        self.__sorted.clear()
+
+    def __window__(self):
+        if self.__count < self.__max_size:
+            return self.__buffer[:self.__count]
+
+        return self.__buffer
+
+    def __resync__(self):
+        # Recompute the running sums once per lap so floating point errors do not accumulate
+        self.__sum = math.fsum(self.__buffer)
+        if self.__track_variance:
+            self.__sqr_sum = math.fsum(v * v for v in self.__buffer)
+
+    def __push_min_max__(self, new_val: float):
+        sample = self.__sample
+        self.__sample += 1
+
+        expired = sample - self.__max_size
+
+        min_queue = self.__min_queue
+        while min_queue and min_queue[-1][1] >= new_val:
+            min_queue.pop()
+        min_queue.append((sample, new_val))
+        if min_queue[0][0] <= expired:
+            min_queue.popleft()
+
+        max_queue = self.__max_queue
+        while max_queue and max_queue[-1][1] <= new_val:
+            max_queue.pop()
+        max_queue.append((sample, new_val))
+        if max_queue[0][0] <= expired:
+            max_queue.popleft()
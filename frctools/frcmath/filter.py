@@ -2,11 +2,29 @@ from frctools import Timer
 
 
 class SlewRateLimiter:
-    def __init__(self, rate: float):
+    def __init__(self, rate: float, bank=None):
         self.rate = rate
         self.last_value = 0.0
 
+        # When registered in a FilterBank (of type SLEW_RATE), the bank steps the filter with its own dt and evaluate
+        # returns the output of the last bank step. That output is one step behind: it does not include this input yet.
+        if bank is not None and bank.filter_type != bank.SLEW_RATE:
+            raise ValueError('SlewRateLimiter needs a FilterBank of type SLEW_RATE')
+
+        self.__bank = bank
+        self.__channel = None if bank is None else bank.add_channel(rate)
+
     def evaluate(self, value: float, dt: float = None) -> float:
+        if self.__bank is not None:
+            if dt is not None:
+                raise ValueError('dt is given by the FilterBank step')
+
+            self.__bank.set_parameter(self.__channel, self.rate)
+            self.__bank.set_input(self.__channel, value)
+
+            self.last_value = self.__bank.get(self.__channel)
+            return self.last_value
+
         if dt is None:
             dt = Timer.get_delta_time()
 
@@ -0,0 +1,147 @@
+from frctools import Timer, CoroutineOrder, Coroutine
+
+
+try:
+    import numpy as np
+
+
+    class FilterBank:
+        SLEW_RATE = 0
+        LOW_PASS = 1
+        LEAKY = 2
+        MEDIAN = 3
+        DEBOUNCE = 4
+
+        # The parameter of a channel depends on the filter:
+        #   SLEW_RATE: max rate of change per second
+        #   LOW_PASS:  time constant in seconds
+        #   LEAKY:     leak factor, the weight of the previous value
+        #   MEDIAN:    unused, the window is the bank median_size
+        #   DEBOUNCE:  time in seconds the input must hold before the output follows
+        def __init__(self, filter_type: int, capacity: int = 16, median_size: int = 5):
+            self.filter_type = filter_type
+            self.median_size = median_size
+
+            self.__count = 0
+
+            self.__input = np.zeros(capacity, dtype=np.float64)
+            self.__output = np.zeros(capacity, dtype=np.float64)
+            self.__parameter = np.zeros(capacity, dtype=np.float64)
+
+            # DEBOUNCE: time the input has been different from the output
+            self.__elapsed = np.zeros(capacity, dtype=np.float64)
+
+            # MEDIAN: ring buffer of the last median_size inputs of every channel
+            self.__history = np.zeros((capacity, median_size), dtype=np.float64)
+            self.__history_index = 0
+
+            self.__coroutine: Coroutine = None
+
+        def add_channel(self, parameter: float = 0., start_value: float = 0.) -> int:
+            if self.__count == len(self.__input):
+                self.__grow__()
+
+            channel = self.__count
+            self.__count += 1
+
+            self.__input[channel] = start_value
+            self.__output[channel] = start_value
+            self.__parameter[channel] = parameter
+            self.__elapsed[channel] = 0.
+            self.__history[channel] = start_value
+
+            return channel
+
+        def get_channel_count(self) -> int:
+            return self.__count
+
+        def set_input(self, channel: int, value: float):
+            self.__input[channel] = value
+
+        def get(self, channel: int) -> float:
+            return float(self.__output[channel])
+
+        def set(self, channel: int, value: float):
+            self.__input[channel] = value
+            self.__output[channel] = value
+            self.__elapsed[channel] = 0.
+            self.__history[channel] = value
+
+        def set_parameter(self, channel: int, parameter: float):
+            self.__parameter[channel] = parameter
+
+        def get_parameter(self, channel: int) -> float:
+            return float(self.__parameter[channel])
+
+        @property
+        def inputs(self) -> 'np.ndarray':
+            return self.__input[:self.__count]
+
+        @property
+        def outputs(self) -> 'np.ndarray':
+            return self.__output[:self.__count]
+
+        def step(self, dt: float = None):
+            if dt is None:
+                dt = Timer.get_delta_time()
+
+            n = self.__count
+            inp = self.__input[:n]
+            out = self.__output[:n]
+            param = self.__parameter[:n]
+
+            if self.filter_type == FilterBank.SLEW_RATE:
+                max_delta = param * dt
+                out += np.clip(inp - out, -max_delta, max_delta)
+            elif self.filter_type == FilterBank.LOW_PASS:
+                # A zero time constant over a zero dt would be 0 / 0, such a channel passes its input through
+                denominator = param + dt
+                alpha = np.divide(dt, denominator, out=np.ones_like(denominator), where=denominator != 0.)
+                out += alpha * (inp - out)
+            elif self.filter_type == FilterBank.LEAKY:
+                out[:] = param * out + (1 - param) * inp
+            elif self.filter_type == FilterBank.MEDIAN:
+                self.__history[:n, self.__history_index] = inp
+                self.__history_index = (self.__history_index + 1) % self.median_size
+                np.median(self.__history[:n], axis=1, out=out)
+            elif self.filter_type == FilterBank.DEBOUNCE:
+                elapsed = self.__elapsed[:n]
+                changed = inp != out
+
+                elapsed += dt
+                elapsed[~changed] = 0.
+
+                settled = elapsed >= param
+                out[settled] = inp[settled]
+                elapsed[settled] = 0.
+
+        def start(self, order: CoroutineOrder = CoroutineOrder.ALLWAYS):
+            self.__coroutine = Timer.start_coroutine_if_stopped(self.__step_loop__, self.__coroutine, order, True)
+
+        def stop(self):
+            if self.__coroutine is not None and not self.__coroutine.is_done:
+                Timer.stop_coroutine(self.__coroutine)
+
+            self.__coroutine = None
+
+        def __step_loop__(self):
+            while True:
+                self.step()
+                yield None
+
+        def __grow__(self):
+            capacity = max(len(self.__input) * 2, 1)
+
+            self.__input = np.resize(self.__input, capacity)
+            self.__output = np.resize(self.__output, capacity)
+            self.__parameter = np.resize(self.__parameter, capacity)
+            self.__elapsed = np.resize(self.__elapsed, capacity)
+            self.__history = np.resize(self.__history, (capacity, self.median_size))
+
+        def __len__(self):
+            return self.__count
+
+except ImportError:
+    class FilterBank:
+        def __init__(self, *args, **kwargs):
+            raise ImportError('numpy is not installed')
@@ -16,22 +16,36 @@ def approximately(a: float, b: float, epsilon=EPSILON) -> bool:
 
 
 def clamp(value: float, min_val: float, max_val: float):
-    return max(min(value, max_val), min_val)
+    if value > max_val:
+        value = max_val
+    if value < min_val:
+        value = min_val
+
+    return value
 
 
 def deadzone(axis: float, deadzone_val: float) -> float:
-    if approximately(axis, 0):
+    if abs(axis) <= EPSILON:
         return 0.
-    elif approximately(axis, 1):
+    elif abs(axis - 1) <= EPSILON:
         return 1.
 
-    deadzone_axis = clamp((abs(axis) - deadzone_val) / (1 - deadzone_val), 0, 1)
+    deadzone_axis = (abs(axis) - deadzone_val) / (1 - deadzone_val)
+    if deadzone_axis <= 0:
+        return math.copysign(0., axis)
+    if deadzone_axis > 1:
+        deadzone_axis = 1.
+
     return math.copysign(deadzone_axis, axis)
 
 
 def repeat(t: float, length: float) -> float:
     t_abs = abs(t)
-    res = clamp(t_abs - math.floor(t_abs / length) * length, 0, length)
+    res = t_abs - math.floor(t_abs / length) * length
+    if res > length:
+        res = length
+    if res < 0:
+        res = 0
 
     return length - res if t < 0 else res
 
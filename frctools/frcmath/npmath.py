@@ -0,0 +1,79 @@
+# Array versions of the frcmath.math kernels, they broadcast over NumPy arrays.
+from .math import EPSILON
+
+import numpy as np
+
+
+def approximately(a, b, epsilon=EPSILON) -> np.ndarray:
+    return np.abs(np.subtract(a, b)) <= epsilon
+
+
+def clamp(value, min_val, max_val) -> np.ndarray:
+    return np.maximum(np.minimum(value, max_val), min_val)
+
+
+def deadzone(axis, deadzone_val) -> np.ndarray:
+    axis = np.asarray(axis, dtype=np.float64)
+
+    deadzone_axis = clamp((np.abs(axis) - deadzone_val) / (1 - deadzone_val), 0., 1.)
+    deadzone_axis = np.copysign(deadzone_axis, axis)
+
+    deadzone_axis = np.where(approximately(axis, 0.), 0., deadzone_axis)
+    return np.where(approximately(axis, 1.), 1., deadzone_axis)
+
+
+def repeat(t, length) -> np.ndarray:
+    t = np.asarray(t, dtype=np.float64)
+
+    t_abs = np.abs(t)
+    res = clamp(t_abs - np.floor(t_abs / length) * length, 0., length)
+
+    return np.where(t < 0, length - res, res)
+
+
+def angle_normalize(angle) -> np.ndarray:
+    return repeat(angle, np.pi * 2)
+
+
+def lerp(a, b, t) -> np.ndarray:
+    return np.multiply(np.subtract(1, t), a) + np.multiply(t, b)
+
+
+def inverse_lerp(a, b, value) -> np.ndarray:
+    return np.divide(np.subtract(value, a), np.subtract(b, a))
+
+
+def lerp_angle(a, b, t) -> np.ndarray:
+    return angle_normalize(lerp(a, b, t))
+
+
+def delta_angle(current, target) -> np.ndarray:
+    t = np.subtract(target, current, dtype=np.float64)
+    length = np.pi * 2
+
+    delta_ang = clamp(t - np.floor(t / length) * length, 0., length)
+    return delta_ang - np.where(delta_ang > np.pi, length, 0.)
+
+
+def between(a, b, v, inclusive: bool = True) -> np.ndarray:
+    if inclusive:
+        return np.logical_and(np.less_equal(a, v), np.less_equal(v, b))
+    return np.logical_and(np.less(a, v), np.less(v, b))
+
+
+def bezier(p0, p1, control, t):
+    # Points are either a single point or (N, 2) arrays, t is a scalar or an array of N samples
+    p0 = np.asarray(p0, dtype=np.float64)
+    p1 = np.asarray(p1, dtype=np.float64)
+    control = np.asarray(control, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)
+
+    u = 1 - t
+    a = u * u
+    b = 2 * u * t
+    c = t * t
+
+    x = a * p0[..., 0] + b * control[..., 0] + c * p1[..., 0]
+    y = a * p0[..., 1] + b * control[..., 1] + c * p1[..., 1]
+
+    return x, y
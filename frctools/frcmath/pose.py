@@ -0,0 +1,243 @@
+from .vector import Vector2, Vector3, Quaternion
+from .vector_array import VectorArrayBase
+
+
+from wpimath.geometry import Pose2d, Pose3d, Rotation3d, Translation3d, Quaternion as WPIQuaternion
+
+
+from typing import Tuple
+
+import math
+
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def __get_points_array__(points, dim: int):
+    if np is None:
+        raise ImportError('numpy is not installed')
+
+    if isinstance(points, VectorArrayBase):
+        return points.data
+
+    return np.asarray(points, dtype=np.float64).reshape(-1, dim)
+
+
+class Pose2:
+    # The sine, cosine, homogeneous matrix and wpimath pose are cached until the pose changes.
+    __slots__ = ('_x', '_y', '_theta', '_cos', '_sin', '_matrix', '_pose2d')
+
+    def __init__(self, x: float = 0., y: float = 0., theta: float = 0.):
+        self.set(x, y, theta)
+
+    def set(self, x: float, y: float, theta: float) -> 'Pose2':
+        self._x = float(x)
+        self._y = float(y)
+        self._theta = float(theta)
+
+        self._cos = math.cos(self._theta)
+        self._sin = math.sin(self._theta)
+
+        self._matrix = None
+        self._pose2d = None
+
+        return self
+
+    @staticmethod
+    def identity() -> 'Pose2':
+        return Pose2(0., 0., 0.)
+
+    @staticmethod
+    def from_vector(position: Vector2, theta: float) -> 'Pose2':
+        return Pose2(position.x, position.y, theta)
+
+    @staticmethod
+    def from_pose2d(pose: Pose2d) -> 'Pose2':
+        pose2 = Pose2(pose.X(), pose.Y(), pose.rotation().radians())
+        pose2._pose2d = pose
+
+        return pose2
+
+    def to_pose2d(self) -> Pose2d:
+        if self._pose2d is None:
+            self._pose2d = Pose2d(self._x, self._y, self._theta)
+
+        return self._pose2d
+
+    @property
+    def x(self) -> float:
+        return self._x
+
+    @property
+    def y(self) -> float:
+        return self._y
+
+    @property
+    def theta(self) -> float:
+        return self._theta
+
+    @property
+    def translation(self) -> Vector2:
+        return Vector2(self._x, self._y)
+
+    @property
+    def matrix(self) -> 'np.ndarray':
+        if self._matrix is None:
+            if np is None:
+                raise ImportError('numpy is not installed')
+
+            self._matrix = np.array([
+                [self._cos, -self._sin, self._x],
+                [self._sin, self._cos, self._y],
+                [0., 0., 1.]
+            ], dtype=np.float64)
+
+        return self._matrix
+
+    @property
+    def inverse(self) -> 'Pose2':
+        c, s = self._cos, self._sin
+        return Pose2(-(c * self._x + s * self._y),
+                     s * self._x - c * self._y,
+                     -self._theta)
+
+    def transform_point(self, point: Vector2) -> Vector2:
+        px, py = point.x, point.y
+        return Vector2(self._cos * px - self._sin * py + self._x,
+                       self._sin * px + self._cos * py + self._y)
+
+    def transform_points(self, points) -> 'np.ndarray':
+        pts = __get_points_array__(points, 2)
+        mtx = self.matrix
+
+        return pts @ mtx[:2, :2].T + mtx[:2, 2]
+
+    def relative_to(self, other: 'Pose2') -> 'Pose2':
+        return other.inverse * self
+
+    def __mul__(self, other: 'Pose2') -> 'Pose2':
+        c, s = self._cos, self._sin
+        return Pose2(c * other._x - s * other._y + self._x,
+                     s * other._x + c * other._y + self._y,
+                     self._theta + other._theta)
+
+    def __str__(self):
+        return f'({self._x}, {self._y}, {self._theta})'
+
+    def __repr__(self):
+        return f'Pose2({str(self)})'
+
+
+class Pose3:
+    # The rotation matrix, homogeneous matrix and wpimath pose are cached until the pose changes.
+    __slots__ = ('_position', '_rotation', '_rotation_matrix', '_matrix', '_pose3d')
+
+    def __init__(self, position: Vector3 = None, rotation: Quaternion = None):
+        self.set(Vector3() if position is None else position,
+                 Quaternion.identity() if rotation is None else rotation)
+
+    def set(self, position: Vector3, rotation: Quaternion) -> 'Pose3':
+        self._position = position.copy()
+        self._rotation = rotation.normalized()
+
+        self._rotation_matrix = None
+        self._matrix = None
+        self._pose3d = None
+
+        return self
+
+    @staticmethod
+    def identity() -> 'Pose3':
+        return Pose3()
+
+    @staticmethod
+    def from_pose3d(pose: Pose3d) -> 'Pose3':
+        quat = pose.rotation().getQuaternion()
+        pose3 = Pose3(Vector3(pose.X(), pose.Y(), pose.Z()),
+                      Quaternion(quat.X(), quat.Y(), quat.Z(), quat.W()))
+        pose3._pose3d = pose
+
+        return pose3
+
+    def to_pose3d(self) -> Pose3d:
+        if self._pose3d is None:
+            pos, rot = self._position, self._rotation
+            self._pose3d = Pose3d(Translation3d(pos.x, pos.y, pos.z),
+                                  Rotation3d(WPIQuaternion(rot.w, rot.x, rot.y, rot.z)))
+
+        return self._pose3d
+
+    @property
+    def position(self) -> Vector3:
+        return self._position.copy()
+
+    @property
+    def rotation(self) -> Quaternion:
+        return self._rotation.copy()
+
+    @property
+    def rotation_matrix(self) -> Tuple[Tuple[float, float, float], ...]:
+        if self._rotation_matrix is None:
+            self._rotation_matrix = self._rotation.to_rotation_matrix()
+
+        return self._rotation_matrix
+
+    @property
+    def matrix(self) -> 'np.ndarray':
+        if self._matrix is None:
+            if np is None:
+                raise ImportError('numpy is not installed')
+
+            mtx = np.eye(4, dtype=np.float64)
+            mtx[:3, :3] = self.rotation_matrix
+            mtx[:3, 3] = self._position.to_tuple()
+
+            self._matrix = mtx
+
+        return self._matrix
+
+    @property
+    def inverse(self) -> 'Pose3':
+        inv_rot = self._rotation.conjugate
+        pos = self.__rotate__(self.__transpose__(), self._position)
+
+        return Pose3(Vector3(-pos.x, -pos.y, -pos.z), inv_rot)
+
+    def transform_point(self, point: Vector3) -> Vector3:
+        rot = self.__rotate__(self.rotation_matrix, point)
+        return Vector3.add_into(rot, rot, self._position)
+
+    def transform_points(self, points) -> 'np.ndarray':
+        pts = __get_points_array__(points, 3)
+        mtx = self.matrix
+
+        return pts @ mtx[:3, :3].T + mtx[:3, 3]
+
+    def relative_to(self, other: 'Pose3') -> 'Pose3':
+        return other.inverse * self
+
+    def __transpose__(self):
+        m = self.rotation_matrix
+        return ((m[0][0], m[1][0], m[2][0]),
+                (m[0][1], m[1][1], m[2][1]),
+                (m[0][2], m[1][2], m[2][2]))
+
+    @staticmethod
+    def __rotate__(m, vec: Vector3) -> Vector3:
+        x, y, z = vec.x, vec.y, vec.z
+        return Vector3(m[0][0] * x + m[0][1] * y + m[0][2] * z,
+                       m[1][0] * x + m[1][1] * y + m[1][2] * z,
+                       m[2][0] * x + m[2][1] * y + m[2][2] * z)
+
+    def __mul__(self, other: 'Pose3') -> 'Pose3':
+        return Pose3(self.transform_point(other._position),
+                     self._rotation * other._rotation)
+
+    def __str__(self):
+        return f'({self._position}, {self._rotation})'
+
+    def __repr__(self):
+        return f'Pose3({str(self)})'
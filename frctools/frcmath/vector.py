@@ -1,4 +1,4 @@
-from .math import angle_normalize
+from .math import angle_normalize, clamp
 
 
 from wpimath.geometry import Translation2d, Translation3d
@@ -9,6 +9,12 @@ from typing import Tuple, List
 import math
 
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
 def __get_vec_from_other__(length: int, other) -> List[float]:
     if isinstance(other, (int, float)):
         return [other] * length
@@ -20,42 +26,74 @@ def __get_vec_from_other__(length: int, other) -> List[float]:
         return list(other[:length])
 
 
-class VectorBase:
-    def __init__(self, *args):
-        self.__list = list(args)
+def __get_vec2_from_other__(other) -> Tuple[float, float]:
+    if isinstance(other, Vector2):
+        return other._x, other._y
 
-        self.__sqr_magnitude = 0.
-        self.__magnitude = 0.
+    if isinstance(other, (int, float)):
+        return other, other
 
-        self.__refresh_magnitude__()
+    return other[0], other[1]
 
-    # --- Vector Methods ---
 
-    def __refresh_sqr_magnitude__(self):
-        mag = 0
-        for val in self:
-            mag += val * val
+def __get_vec3_from_other__(other) -> Tuple[float, float, float]:
+    if isinstance(other, Vector3):
+        return other._x, other._y, other._z
+
+    if isinstance(other, (int, float)):
+        return other, other, other
+
+    return other[0], other[1], other[2]
+
+
+def __get_vec4_from_other__(other) -> Tuple[float, float, float, float]:
+    if isinstance(other, Vector4):
+        return other._x, other._y, other._z, other._w
+
+    if isinstance(other, (int, float)):
+        return other, other, other, other
 
-        self.__sqr_magnitude = mag
+    return other[0], other[1], other[2], other[3]
+
+
+class VectorBase:
+    # The magnitude is only computed when it is read and cached until one of the components changes.
+    __slots__ = ('_magnitude', '_dirty')
+
+    _FIELDS: Tuple[str, ...] = ()
+
+    def __init__(self, *args):
+        for field, value in zip(self._FIELDS, args):
+            setattr(self, field, value)
+
+        self._magnitude = 0.
+        self._dirty = True
+
+    # --- Vector Methods ---
 
     @property
     def sqr_magnitude(self) -> float:
-        return self.__sqr_magnitude
+        mag = 0.
+        for val in self:
+            mag += val * val
 
-    def __refresh_magnitude__(self):
-        self.__refresh_sqr_magnitude__()
-        self.__magnitude = math.sqrt(self.__sqr_magnitude)
+        return mag
 
     @property
     def magnitude(self) -> float:
-        return self.__magnitude
+        if self._dirty:
+            self._magnitude = math.sqrt(self.sqr_magnitude)
+            self._dirty = False
+
+        return self._magnitude
 
     def normalize(self):
-        for i in range(len(self)):
-            self[i] /= self.magnitude
+        mag = self.magnitude
+        for field in self._FIELDS:
+            setattr(self, field, getattr(self, field) / mag)
 
-        self.__magnitude = 1.
-        self.__sqr_magnitude = 1.
+        self._magnitude = 1.
+        self._dirty = False
 
         return self
 
@@ -89,79 +127,67 @@ class VectorBase:
 
     def __add__(self, other):
         other_vec = __get_vec_from_other__(len(self), other)
-        new_vec = self.__class__(0., 0., 0.)
-        for i in range(len(self)):
-            new_vec[i] = self[i] + other_vec[i]
-
-        new_vec.__refresh_magnitude__()
-        return new_vec
+        return self.__class__(*[a + b for a, b in zip(self, other_vec)])
 
     def __iadd__(self, other):
         other_vec = __get_vec_from_other__(len(self), other)
-        for i in range(len(self)):
-            self[i] += other_vec[i]
+        for field, val in zip(self._FIELDS, other_vec):
+            setattr(self, field, getattr(self, field) + val)
 
+        self._dirty = True
         return self
 
     def __sub__(self, other):
         other_vec = __get_vec_from_other__(len(self), other)
-        new_vec = self.__class__(0., 0., 0.)
-        for i in range(len(self)):
-            new_vec[i] = self[i] - other_vec[i]
-
-        new_vec.__refresh_magnitude__()
-        return new_vec
+        return self.__class__(*[a - b for a, b in zip(self, other_vec)])
 
     def __isub__(self, other):
         other_vec = __get_vec_from_other__(len(self), other)
-        for i in range(len(self)):
-            self[i] -= other_vec[i]
+        for field, val in zip(self._FIELDS, other_vec):
+            setattr(self, field, getattr(self, field) - val)
 
+        self._dirty = True
         return self
 
     def __mul__(self, other):
         other_vec = __get_vec_from_other__(len(self), other)
-        new_vec = self.__class__(0., 0., 0.)
-        for i in range(len(self)):
-            new_vec[i] = self[i] * other_vec[i]
-
-        new_vec.__refresh_magnitude__()
-        return new_vec
+        return self.__class__(*[a * b for a, b in zip(self, other_vec)])
 
     def __imul__(self, other):
         other_vec = __get_vec_from_other__(len(self), other)
-        for i in range(len(self)):
-            self[i] *= other_vec[i]
+        for field, val in zip(self._FIELDS, other_vec):
+            setattr(self, field, getattr(self, field) * val)
 
+        self._dirty = True
         return self
 
     def __truediv__(self, other):
         other_vec = __get_vec_from_other__(len(self), other)
-        new_vec = self.__class__(0., 0., 0.)
-        for i in range(len(self)):
-            new_vec[i] = self[i] / other_vec[i]
-
-        new_vec.__refresh_magnitude__()
-        return new_vec
+        return self.__class__(*[a / b for a, b in zip(self, other_vec)])
 
     def __itruediv__(self, other):
         other_vec = __get_vec_from_other__(len(self), other)
-        for i in range(len(self)):
-            self[i] /= other_vec[i]
+        for field, val in zip(self._FIELDS, other_vec):
+            setattr(self, field, getattr(self, field) / val)
 
+        self._dirty = True
         return self
 
     def __getitem__(self, item):
-        return self.__list[item]
+        if isinstance(item, slice):
+            return [getattr(self, field) for field in self._FIELDS[item]]
+
+        return getattr(self, self._FIELDS[item])
 
     def __setitem__(self, key, value):
-        self.__list[key] = value
+        setattr(self, self._FIELDS[key], value)
+        self._dirty = True
 
     def __iter__(self):
-        yield from self.__list
+        return iter([getattr(self, field) for field in self._FIELDS])
 
     def __len__(self):
-        raise NotImplementedError()
+        return len(self._FIELDS)
 
     def __str__(self):
         str_list = [str(i) for i in self]
@@ -172,34 +198,82 @@ class VectorBase:
 
 
 class Range(VectorBase):
+    __slots__ = ('_min', '_max')
+
+    _FIELDS = ('_min', '_max')
+
     def __init__(self, min: float, max: float):
-        super().__init__(float(min), float(max))
+        self._min = float(min)
+        self._max = float(max)
+        self._dirty = True
 
     @property
     def min(self):
-        return self[0]
+        return self._min
     @min.setter
     def min(self, value: float):
-        self[0] = value
+        self._min = value
+        self._dirty = True
 
     @property
     def max(self):
-        return self[1]
+        return self._max
     @max.setter
     def max(self, value: float):
-        self[1] = value
+        self._max = value
+        self._dirty = True
 
     def __len__(self):
         return 2
 
 
 class Vector2(VectorBase):
+    __slots__ = ('_x', '_y')
+
+    _FIELDS = ('_x', '_y')
+
     def __init__(self, x: float = 0., y: float = 0.):
-        super().__init__(float(x), float(y))
+        self._x = float(x)
+        self._y = float(y)
+        self._dirty = True
 
     # --- Vector Methods ---
+    @property
+    def sqr_magnitude(self) -> float:
+        return self._x * self._x + self._y * self._y
+
+    @property
+    def magnitude(self) -> float:
+        if self._dirty:
+            self._magnitude = math.hypot(self._x, self._y)
+            self._dirty = False
+
+        return self._magnitude
+
+    def normalize(self) -> 'Vector2':
+        mag = self.magnitude
+        self._x /= mag
+        self._y /= mag
+
+        self._magnitude = 1.
+        self._dirty = False
+
+        return self
+
+    def normalized(self) -> 'Vector2':
+        mag = self.magnitude
+        vec = self.__class__(self._x / mag, self._y / mag)
+
+        vec._magnitude = 1.
+        vec._dirty = False
+
+        return vec
+
+    def copy(self) -> 'Vector2':
+        return self.__class__(self._x, self._y)
+
     def dot(self, other: 'Vector2') -> float:
-        return self.x * other.x + self.y * other.y
+        return self._x * other.x + self._y * other.y
 
     def angle(self, other: 'Vector2') -> float:
         return math.acos(self.dot(other) / (self.magnitude * other.magnitude))
@@ -208,8 +282,66 @@ class Vector2(VectorBase):
         cos_t = math.cos(theta)
         sin_t = math.sin(theta)
 
-        return Vector2(self.x * cos_t - self.y * sin_t,
-                       self.x * sin_t + self.y * cos_t)
+        return Vector2(self._x * cos_t - self._y * sin_t,
+                       self._x * sin_t + self._y * cos_t)
+
+    # --- In-Place Methods ---
+    def set(self, x: float, y: float) -> 'Vector2':
+        self._x = x
+        self._y = y
+        self._dirty = True
+
+        return self
+
+    def rotate_inplace(self, theta) -> 'Vector2':
+        return Vector2.rotate_into(self, self, theta)
+
+    @staticmethod
+    def add_into(out: 'Vector2', a: 'Vector2', b: 'Vector2') -> 'Vector2':
+        out._x = a._x + b._x
+        out._y = a._y + b._y
+        out._dirty = True
+
+        return out
+
+    @staticmethod
+    def sub_into(out: 'Vector2', a: 'Vector2', b: 'Vector2') -> 'Vector2':
+        out._x = a._x - b._x
+        out._y = a._y - b._y
+        out._dirty = True
+
+        return out
+
+    @staticmethod
+    def scale_into(out: 'Vector2', a: 'Vector2', scale: float) -> 'Vector2':
+        out._x = a._x * scale
+        out._y = a._y * scale
+        out._dirty = True
+
+        return out
+
+    @staticmethod
+    def rotate_into(out: 'Vector2', a: 'Vector2', theta: float) -> 'Vector2':
+        cos_t = math.cos(theta)
+        sin_t = math.sin(theta)
+
+        x = a._x * cos_t - a._y * sin_t
+        out._y = a._x * sin_t + a._y * cos_t
+        out._x = x
+        out._dirty = True
+
+        return out
+
+    @staticmethod
+    def normalize_into(out: 'Vector2', a: 'Vector2') -> 'Vector2':
+        mag = a.magnitude
+        out._x = a._x / mag
+        out._y = a._y / mag
+
+        out._magnitude = 1.
+        out._dirty = False
+
+        return out
 
     # Constants
     @staticmethod
@@ -222,38 +354,131 @@ class Vector2(VectorBase):
 
     # --- Operators Overloads ---
 
+    def __add__(self, other):
+        ox, oy = __get_vec2_from_other__(other)
+        return self.__class__(self._x + ox, self._y + oy)
+
+    def __iadd__(self, other):
+        ox, oy = __get_vec2_from_other__(other)
+        self._x += ox
+        self._y += oy
+
+        self._dirty = True
+        return self
+
+    def __sub__(self, other):
+        ox, oy = __get_vec2_from_other__(other)
+        return self.__class__(self._x - ox, self._y - oy)
+
+    def __isub__(self, other):
+        ox, oy = __get_vec2_from_other__(other)
+        self._x -= ox
+        self._y -= oy
+
+        self._dirty = True
+        return self
+
+    def __mul__(self, other):
+        ox, oy = __get_vec2_from_other__(other)
+        return self.__class__(self._x * ox, self._y * oy)
+
+    def __imul__(self, other):
+        ox, oy = __get_vec2_from_other__(other)
+        self._x *= ox
+        self._y *= oy
+
+        self._dirty = True
+        return self
+
+    def __truediv__(self, other):
+        ox, oy = __get_vec2_from_other__(other)
+        return self.__class__(self._x / ox, self._y / oy)
+
+    def __itruediv__(self, other):
+        ox, oy = __get_vec2_from_other__(other)
+        self._x /= ox
+        self._y /= oy
+
+        self._dirty = True
+        return self
+
     @property
     def x(self) -> float:
-        return self[0]
+        return self._x
 
     @x.setter
     def x(self, value: float):
-        self[0] = value
-        self.__refresh_magnitude__()
+        self._x = value
+        self._dirty = True
 
     @property
     def y(self) -> float:
-        return self[1]
+        return self._y
 
     @y.setter
     def y(self, value: float):
-        self[1] = value
-        self.__refresh_magnitude__()
+        self._y = value
+        self._dirty = True
+
+    def __iter__(self):
+        return iter((self._x, self._y))
 
     def __len__(self):
         return 2
 
     def to_translation2d(self) -> Translation2d:
-        return Translation2d(self.x, self.y)
+        return Translation2d(self._x, self._y)
 
 
 class Vector3(VectorBase):
+    __slots__ = ('_x', '_y', '_z')
+
+    _FIELDS = ('_x', '_y', '_z')
+
     def __init__(self, x: float = 0., y: float = 0., z: float = 0.):
-        super().__init__(float(x), float(y), float(z))
+        self._x = float(x)
+        self._y = float(y)
+        self._z = float(z)
+        self._dirty = True
 
     # --- Vector Methods ---
+    @property
+    def sqr_magnitude(self) -> float:
+        return self._x * self._x + self._y * self._y + self._z * self._z
+
+    @property
+    def magnitude(self) -> float:
+        if self._dirty:
+            self._magnitude = math.sqrt(self._x * self._x + self._y * self._y + self._z * self._z)
+            self._dirty = False
+
+        return self._magnitude
+
+    def normalize(self) -> 'Vector3':
+        mag = self.magnitude
+        self._x /= mag
+        self._y /= mag
+        self._z /= mag
+
+        self._magnitude = 1.
+        self._dirty = False
+
+        return self
+
+    def normalized(self) -> 'Vector3':
+        mag = self.magnitude
+        vec = self.__class__(self._x / mag, self._y / mag, self._z / mag)
+
+        vec._magnitude = 1.
+        vec._dirty = False
+
+        return vec
+
+    def copy(self) -> 'Vector3':
+        return self.__class__(self._x, self._y, self._z)
+
     def dot(self, other: 'Vector3') -> float:
-        return self.x * other.x + self.y * other.y + self.z * other.z
+        return self._x * other.x + self._y * other.y + self._z * other.z
 
     def cross(self, other: 'Vector3') -> 'Vector3':
         return Vector3(
@@ -265,91 +490,311 @@ class Vector3(VectorBase):
     def angle(self, other: 'Vector3') -> float:
         return math.acos(self.dot(other) / (self.magnitude * other.magnitude))
 
+    # --- In-Place Methods ---
+    def set(self, x: float, y: float, z: float) -> 'Vector3':
+        self._x = x
+        self._y = y
+        self._z = z
+        self._dirty = True
+
+        return self
+
+    @staticmethod
+    def add_into(out: 'Vector3', a: 'Vector3', b: 'Vector3') -> 'Vector3':
+        out._x = a._x + b._x
+        out._y = a._y + b._y
+        out._z = a._z + b._z
+        out._dirty = True
+
+        return out
+
+    @staticmethod
+    def sub_into(out: 'Vector3', a: 'Vector3', b: 'Vector3') -> 'Vector3':
+        out._x = a._x - b._x
+        out._y = a._y - b._y
+        out._z = a._z - b._z
+        out._dirty = True
+
+        return out
+
+    @staticmethod
+    def scale_into(out: 'Vector3', a: 'Vector3', scale: float) -> 'Vector3':
+        out._x = a._x * scale
+        out._y = a._y * scale
+        out._z = a._z * scale
+        out._dirty = True
+
+        return out
+
+    @staticmethod
+    def cross_into(out: 'Vector3', a: 'Vector3', b: 'Vector3') -> 'Vector3':
+        x = a._y * b._z - a._z * b._y
+        y = a._z * b._x - a._x * b._z
+        out._z = a._x * b._y - a._y * b._x
+        out._x = x
+        out._y = y
+        out._dirty = True
+
+        return out
+
+    @staticmethod
+    def normalize_into(out: 'Vector3', a: 'Vector3') -> 'Vector3':
+        mag = a.magnitude
+        out._x = a._x / mag
+        out._y = a._y / mag
+        out._z = a._z / mag
+
+        out._magnitude = 1.
+        out._dirty = False
+
+        return out
+
     # --- Operators Overloads ---
+
+    def __add__(self, other):
+        ox, oy, oz = __get_vec3_from_other__(other)
+        return self.__class__(self._x + ox, self._y + oy, self._z + oz)
+
+    def __iadd__(self, other):
+        ox, oy, oz = __get_vec3_from_other__(other)
+        self._x += ox
+        self._y += oy
+        self._z += oz
+
+        self._dirty = True
+        return self
+
+    def __sub__(self, other):
+        ox, oy, oz = __get_vec3_from_other__(other)
+        return self.__class__(self._x - ox, self._y - oy, self._z - oz)
+
+    def __isub__(self, other):
+        ox, oy, oz = __get_vec3_from_other__(other)
+        self._x -= ox
+        self._y -= oy
+        self._z -= oz
+
+        self._dirty = True
+        return self
+
+    def __mul__(self, other):
+        ox, oy, oz = __get_vec3_from_other__(other)
+        return self.__class__(self._x * ox, self._y * oy, self._z * oz)
+
+    def __imul__(self, other):
+        ox, oy, oz = __get_vec3_from_other__(other)
+        self._x *= ox
+        self._y *= oy
+        self._z *= oz
+
+        self._dirty = True
+        return self
+
+    def __truediv__(self, other):
+        ox, oy, oz = __get_vec3_from_other__(other)
+        return self.__class__(self._x / ox, self._y / oy, self._z / oz)
+
+    def __itruediv__(self, other):
+        ox, oy, oz = __get_vec3_from_other__(other)
+        self._x /= ox
+        self._y /= oy
+        self._z /= oz
+
+        self._dirty = True
+        return self
+
     @property
     def x(self) -> float:
-        return self[0]
+        return self._x
 
     @x.setter
     def x(self, value: float):
-        self[0] = value
-        self.__refresh_magnitude__()
+        self._x = value
+        self._dirty = True
 
     @property
     def y(self) -> float:
-        return self[1]
+        return self._y
 
     @y.setter
     def y(self, value: float):
-        self[1] = value
-        self.__refresh_magnitude__()
+        self._y = value
+        self._dirty = True
 
     @property
     def z(self) -> float:
-        return self[2]
+        return self._z
 
     @z.setter
     def z(self, value: float):
-        self[2] = value
-        self.__refresh_magnitude__()
+        self._z = value
+        self._dirty = True
+
+    def __iter__(self):
+        return iter((self._x, self._y, self._z))
 
     def __len__(self):
         return 3
 
     def to_translation3d(self) -> Translation3d:
-        return Translation3d(self.x, self.y, self.z)
+        return Translation3d(self._x, self._y, self._z)
 
 
 class Vector4(VectorBase):
+    __slots__ = ('_x', '_y', '_z', '_w')
+
+    _FIELDS = ('_x', '_y', '_z', '_w')
+
     def __init__(self, x: float = 0, y: float = 0, z: float = 0, w: float = 0):
-        super().__init__(float(x), float(y), float(z), float(w))
+        self._x = float(x)
+        self._y = float(y)
+        self._z = float(z)
+        self._w = float(w)
+        self._dirty = True
 
     # --- Vector Methods ---
+    @property
+    def sqr_magnitude(self) -> float:
+        return self._x * self._x + self._y * self._y + self._z * self._z + self._w * self._w
+
+    @property
+    def magnitude(self) -> float:
+        if self._dirty:
+            self._magnitude = math.sqrt(self._x * self._x + self._y * self._y + self._z * self._z + self._w * self._w)
+            self._dirty = False
+
+        return self._magnitude
+
+    def normalize(self):
+        mag = self.magnitude
+        self._x /= mag
+        self._y /= mag
+        self._z /= mag
+        self._w /= mag
+
+        self._magnitude = 1.
+        self._dirty = False
+
+        return self
+
+    def normalized(self):
+        mag = self.magnitude
+        vec = self.__class__(self._x / mag, self._y / mag, self._z / mag, self._w / mag)
+
+        vec._magnitude = 1.
+        vec._dirty = False
+
+        return vec
+
+    def copy(self):
+        return self.__class__(self._x, self._y, self._z, self._w)
 
     # --- Operators Overloads ---
+
+    def __add__(self, other):
+        ox, oy, oz, ow = __get_vec4_from_other__(other)
+        return self.__class__(self._x + ox, self._y + oy, self._z + oz, self._w + ow)
+
+    def __iadd__(self, other):
+        ox, oy, oz, ow = __get_vec4_from_other__(other)
+        self._x += ox
+        self._y += oy
+        self._z += oz
+        self._w += ow
+
+        self._dirty = True
+        return self
+
+    def __sub__(self, other):
+        ox, oy, oz, ow = __get_vec4_from_other__(other)
+        return self.__class__(self._x - ox, self._y - oy, self._z - oz, self._w - ow)
+
+    def __isub__(self, other):
+        ox, oy, oz, ow = __get_vec4_from_other__(other)
+        self._x -= ox
+        self._y -= oy
+        self._z -= oz
+        self._w -= ow
+
+        self._dirty = True
+        return self
+
+    def __mul__(self, other):
+        ox, oy, oz, ow = __get_vec4_from_other__(other)
+        return self.__class__(self._x * ox, self._y * oy, self._z * oz, self._w * ow)
+
+    def __imul__(self, other):
+        ox, oy, oz, ow = __get_vec4_from_other__(other)
+        self._x *= ox
+        self._y *= oy
+        self._z *= oz
+        self._w *= ow
+
+        self._dirty = True
+        return self
+
+    def __truediv__(self, other):
+        ox, oy, oz, ow = __get_vec4_from_other__(other)
+        return self.__class__(self._x / ox, self._y / oy, self._z / oz, self._w / ow)
+
+    def __itruediv__(self, other):
+        ox, oy, oz, ow = __get_vec4_from_other__(other)
+        self._x /= ox
+        self._y /= oy
+        self._z /= oz
+        self._w /= ow
+
+        self._dirty = True
+        return self
+
     @property
     def x(self) -> float:
-        return self[0]
+        return self._x
 
     @x.setter
     def x(self, value: float):
-        self[0] = value
-        self.__refresh_magnitude__()
+        self._x = value
+        self._dirty = True
 
     @property
     def y(self) -> float:
-        return self[1]
+        return self._y
 
     @y.setter
     def y(self, value: float):
-        self[1] = value
-        self.__refresh_magnitude__()
+        self._y = value
+        self._dirty = True
 
     @property
     def z(self) -> float:
-        return self[2]
+        return self._z
 
     @z.setter
     def z(self, value: float):
-        self[2] = value
-        self.__refresh_magnitude__()
+        self._z = value
+        self._dirty = True
 
     @property
     def w(self) -> float:
-        return self[3]
+        return self._w
 
     @w.setter
     def w(self, value: float):
-        self[3] = value
-        self.__refresh_magnitude__()
+        self._w = value
+        self._dirty = True
+
+    def __iter__(self):
+        return iter((self._x, self._y, self._z, self._w))
 
     def __len__(self):
         return 4
 
 
-class Quaternion(VectorBase):
+class Quaternion(Vector4):
+    __slots__ = ()
+
     def __init__(self, x: float, y: float, z: float, w: float):
-        super().__init__(float(x), float(y), float(z), float(w))
+        super().__init__(x, y, z, w)
 
     @staticmethod
     def from_euler(euler) -> 'Quaternion':
@@ -374,10 +819,10 @@ class Quaternion(VectorBase):
         y_common = 2 * (self.w * self.y - self.x * self.z)
         sinp = math.sqrt(1 + y_common)
         cosp = math.sqrt(1 - y_common)
-        y = math.atan2(sinp, cosp) - math.pi / 2
+        y = 2 * math.atan2(sinp, cosp) - math.pi / 2
 
         siny_cosp = 2 * (self.w * self.z + self.x * self.y)
-        cosy_cosp = 1 - 2 * (self.y**2 + self.z * self.y**2)
+        cosy_cosp = 1 - 2 * (self.y**2 + self.z**2)
         z = math.atan2(siny_cosp, cosy_cosp)
 
         return Vector3(x, y, z)
@@ -409,75 +854,147 @@ class Quaternion(VectorBase):
             quat[i] = 0.5 * trace
             trace = 0.5 / trace
 
-            quat[3]  = (mtx[k][j] - mtx[j][k]) * trace
-            quat[j] = (mtx[j][i] - mtx[i][j]) * trace
-            quat[k] = (mtx[k][i] - mtx[i][k]) * trace
+            quat[3] = (mtx[k][j] - mtx[j][k]) * trace
+            quat[j] = (mtx[j][i] + mtx[i][j]) * trace
+            quat[k] = (mtx[k][i] + mtx[i][k]) * trace
 
         return quat
 
-    # TODO: Add Custom Quaternion Operators
+    @staticmethod
+    def identity() -> 'Quaternion':
+        return Quaternion(0, 0, 0, 1)
 
-    @property
-    def x(self) -> float:
-        return self[0]
+    @staticmethod
+    def from_axis_angle(axis: Vector3, angle: float) -> 'Quaternion':
+        mag = axis.magnitude
+        if mag == 0:
+            return Quaternion.identity()
 
-    @x.setter
-    def x(self, value: float):
-        self[0] = value
-        self.__refresh_magnitude__()
+        s = math.sin(angle * 0.5) / mag
+        return Quaternion(axis.x * s, axis.y * s, axis.z * s, math.cos(angle * 0.5))
 
-    @property
-    def y(self) -> float:
-        return self[1]
+    def to_axis_angle(self) -> Tuple[Vector3, float]:
+        mag = self.magnitude
+        w = clamp(self._w / mag, -1., 1.)
 
-    @y.setter
-    def y(self, value: float):
-        self[1] = value
-        self.__refresh_magnitude__()
+        angle = 2 * math.acos(w)
+        s = math.sqrt(1 - w * w) * mag
+        if s < 1e-9:
+            return Vector3(1, 0, 0), 0.
 
-    @property
-    def z(self) -> float:
-        return self[2]
+        return Vector3(self._x / s, self._y / s, self._z / s), angle
 
-    @z.setter
-    def z(self, value: float):
-        self[2] = value
-        self.__refresh_magnitude__()
+    def to_rotation_matrix(self) -> Tuple[Tuple[float, float, float], ...]:
+        # Scaling by 2 / |q|^2 makes the matrix a pure rotation even if the quaternion is not normalized
+        s = 2. / self.sqr_magnitude
+        x, y, z, w = self._x, self._y, self._z, self._w
 
-    @property
-    def w(self) -> float:
-        return self[3]
+        xx, yy, zz = x * x * s, y * y * s, z * z * s
+        xy, xz, yz = x * y * s, x * z * s, y * z * s
+        wx, wy, wz = w * x * s, w * y * s, w * z * s
 
-    @w.setter
-    def w(self, value: float):
-        self[3] = value
-        self.__refresh_magnitude__()
+        return ((1 - (yy + zz), xy - wz, xz + wy),
+                (xy + wz, 1 - (xx + zz), yz - wx),
+                (xz - wy, yz + wx, 1 - (xx + yy)))
 
     @property
-    def conjugate(self):
-        norm = self.normalized()
-        return Quaternion(-norm.x, -norm.y, -norm.z, norm.w)
+    def conjugate(self) -> 'Quaternion':
+        return Quaternion(-self._x, -self._y, -self._z, self._w)
+
+    @property
+    def inverse(self) -> 'Quaternion':
+        sqr_mag = self.sqr_magnitude
+        return Quaternion(-self._x / sqr_mag, -self._y / sqr_mag, -self._z / sqr_mag, self._w / sqr_mag)
+
+    def slerp(self, other: 'Quaternion', t: float) -> 'Quaternion':
+        ox, oy, oz, ow = other._x, other._y, other._z, other._w
+        dot = self._x * ox + self._y * oy + self._z * oz + self._w * ow
+
+        # Take the shortest path
+        if dot < 0:
+            ox, oy, oz, ow = -ox, -oy, -oz, -ow
+            dot = -dot
+
+        # The quaternions are almost the same, a normalized lerp is accurate enough
+        if dot > 0.9995:
+            return Quaternion(self._x + (ox - self._x) * t,
+                              self._y + (oy - self._y) * t,
+                              self._z + (oz - self._z) * t,
+                              self._w + (ow - self._w) * t).normalize()
+
+        theta_0 = math.acos(dot)
+        sin_theta_0 = math.sin(theta_0)
+
+        s1 = math.sin(theta_0 * t) / sin_theta_0
+        s0 = math.cos(theta_0 * t) - dot * s1
+
+        return Quaternion(self._x * s0 + ox * s1,
+                          self._y * s0 + oy * s1,
+                          self._z * s0 + oz * s1,
+                          self._w * s0 + ow * s1)
+
+    def rotate(self, vec: Vector3) -> Vector3:
+        # Normalize once, then v' = v + w * t + q x t with t = 2 * (q x v)
+        mag = self.magnitude
+        x, y, z, w = self._x / mag, self._y / mag, self._z / mag, self._w / mag
+        vx, vy, vz = vec.x, vec.y, vec.z
+
+        tx = 2 * (y * vz - z * vy)
+        ty = 2 * (z * vx - x * vz)
+        tz = 2 * (x * vy - y * vx)
+
+        return Vector3(vx + w * tx + y * tz - z * ty,
+                       vy + w * ty + z * tx - x * tz,
+                       vz + w * tz + x * ty - y * tx)
+
+    def rotate_points(self, points):
+        if np is None:
+            raise ImportError('numpy is not installed')
+
+        # One 3x3 matrix for the whole set of points instead of two quaternion products per point
+        mtx = np.array(self.to_rotation_matrix(), dtype=np.float64)
+        return np.asarray(points, dtype=np.float64) @ mtx.T
 
     def __mul__(self, other):
         if isinstance(other, Quaternion):
             return Quaternion(
-                (self.w * other.x) + (self.x * other.w) + (self.y * other.z) - (self.z * other.y),
-                (self.w * other.y) - (self.x * other.z) + (self.y * other.w) + (self.z * other.x),
-                (self.w * other.z) + (self.x * other.y) - (self.y * other.x) + (self.z * other.w),
-                (self.w * other.w) - (self.x * other.x) - (self.y * other.y) - (self.z * other.z)
+                (self._w * other._x) + (self._x * other._w) + (self._y * other._z) - (self._z * other._y),
+                (self._w * other._y) - (self._x * other._z) + (self._y * other._w) + (self._z * other._x),
+                (self._w * other._z) + (self._x * other._y) - (self._y * other._x) + (self._z * other._w),
+                (self._w * other._w) - (self._x * other._x) - (self._y * other._y) - (self._z * other._z)
             )
         if isinstance(other, Vector3):
-            q_conj = self.conjugate
-            v_quat = Quaternion(other.x, other.y, other.z, 0)
-
-            rot = (self * v_quat) * q_conj
+            return self.rotate(other)
 
-            return Vector3(rot.x, rot.y, rot.z)
+        return super().__mul__(other)
 
     def __len__(self):
         return 4
 
 
+class VectorPool:
+    # Scratch vectors handed out during a loop and recycled all at once with reset().
+    def __init__(self, vector_type=Vector2, size: int = 8):
+        self.__vector_type = vector_type
+        self.__pool = [vector_type() for _ in range(size)]
+        self.__index = 0
+
+    def get(self):
+        if self.__index == len(self.__pool):
+            self.__pool.append(self.__vector_type())
+
+        vec = self.__pool[self.__index]
+        self.__index += 1
+
+        return vec
+
+    def reset(self):
+        self.__index = 0
+
+    def __len__(self):
+        return len(self.__pool)
+
+
 class Polar:
     def __init__(self, theta, radius):
         self.theta = theta
@@ -486,7 +1003,7 @@ class Polar:
     @staticmethod
     def from_vector(vec) -> 'Polar':
         return Polar(angle_normalize(math.atan2(vec.y, vec.x)),
-                     vec.magnitude())
+                     vec.magnitude)
 
     def to_vector(self) -> Vector2:
         return Vector2(self.radius * math.cos(self.theta),
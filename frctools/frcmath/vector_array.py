@@ -0,0 +1,244 @@
+from .vector import Vector2, Vector3, Quaternion
+
+
+from typing import List
+
+
+try:
+    import numpy as np
+
+
+    def __get_array_from_other__(dim: int, other):
+        if isinstance(other, VectorArrayBase):
+            return other.data
+
+        if isinstance(other, (Vector2, Vector3)):
+            return np.array(other.to_tuple(), dtype=np.float64)
+
+        # A 1-D array is always one value per component. One scalar per vector must be an (N, 1) array, a 1-D array
+        # with as many values as vectors would be ambiguous when N == dim.
+        if isinstance(other, np.ndarray) and other.ndim == 1 and other.shape[0] != dim:
+            raise ValueError(f'expected {dim} components, use an (N, 1) array for one value per vector')
+
+        return other
+
+
+    def __get_rotation_matrix__(rotation) -> 'np.ndarray':
+        if isinstance(rotation, Quaternion):
+            rotation = rotation.to_rotation_matrix()
+
+        return np.asarray(rotation, dtype=np.float64)
+
+
+    class VectorArrayBase:
+        # N vectors stored as one contiguous (N, dim) float64 array.
+        _DIM = 0
+        _VECTOR_TYPE = None
+
+        def __init__(self, data=None):
+            if data is None:
+                data = np.zeros((0, self._DIM), dtype=np.float64)
+            else:
+                data = np.ascontiguousarray(data, dtype=np.float64).reshape(-1, self._DIM)
+
+            self.data = data
+
+        @classmethod
+        def zeros(cls, count: int):
+            return cls(np.zeros((count, cls._DIM), dtype=np.float64))
+
+        @classmethod
+        def from_vectors(cls, vectors: List):
+            return cls(np.array([vec.to_tuple() for vec in vectors], dtype=np.float64))
+
+        def to_vectors(self) -> List:
+            vec_type = self._VECTOR_TYPE
+            return [vec_type(*row) for row in self.data.tolist()]
+
+        @classmethod
+        def from_list(cls, lst):
+            return cls(np.array(lst, dtype=np.float64))
+
+        def to_list(self) -> List:
+            return self.data.tolist()
+
+        def to_numpy(self) -> 'np.ndarray':
+            return self.data
+
+        def copy(self):
+            return self.__class__(self.data.copy())
+
+        # --- Vector Methods ---
+
+        @property
+        def sqr_magnitude(self) -> 'np.ndarray':
+            return np.einsum('ij,ij->i', self.data, self.data)
+
+        @property
+        def magnitude(self) -> 'np.ndarray':
+            return np.sqrt(self.sqr_magnitude)
+
+        def normalize(self):
+            mag = self.magnitude
+            np.divide(self.data, mag[:, None], out=self.data, where=mag[:, None] > 0)
+
+            return self
+
+        def normalized(self):
+            return self.copy().normalize()
+
+        def dot(self, other) -> 'np.ndarray':
+            other_arr = np.broadcast_to(__get_array_from_other__(self._DIM, other), self.data.shape)
+            return np.einsum('ij,ij->i', self.data, other_arr)
+
+        def lerp(self, other, t):
+            other_arr = __get_array_from_other__(self._DIM, other)
+            t = __get_array_from_other__(self._DIM, t)
+
+            return self.__class__(self.data + (other_arr - self.data) * t)
+
+        # --- Operators Overloads ---
+
+        def __add__(self, other):
+            return self.__class__(self.data + __get_array_from_other__(self._DIM, other))
+
+        def __iadd__(self, other):
+            self.data += __get_array_from_other__(self._DIM, other)
+            return self
+
+        def __sub__(self, other):
+            return self.__class__(self.data - __get_array_from_other__(self._DIM, other))
+
+        def __isub__(self, other):
+            self.data -= __get_array_from_other__(self._DIM, other)
+            return self
+
+        def __mul__(self, other):
+            return self.__class__(self.data * __get_array_from_other__(self._DIM, other))
+
+        def __imul__(self, other):
+            self.data *= __get_array_from_other__(self._DIM, other)
+            return self
+
+        def __truediv__(self, other):
+            return self.__class__(self.data / __get_array_from_other__(self._DIM, other))
+
+        def __itruediv__(self, other):
+            self.data /= __get_array_from_other__(self._DIM, other)
+            return self
+
+        def __getitem__(self, item):
+            if isinstance(item, (int, np.integer)):
+                return self._VECTOR_TYPE(*self.data[item].tolist())
+
+            return self.__class__(self.data[item])
+
+        def __setitem__(self, key, value):
+            self.data[key] = __get_array_from_other__(self._DIM, value)
+
+        def __iter__(self):
+            vec_type = self._VECTOR_TYPE
+            for row in self.data.tolist():
+                yield vec_type(*row)
+
+        def __len__(self):
+            return self.data.shape[0]
+
+        def __str__(self):
+            return str(self.data)
+
+        def __repr__(self):
+            return f'{type(self)}({len(self)})'
+
+
+    class Vector2Array(VectorArrayBase):
+        _DIM = 2
+        _VECTOR_TYPE = Vector2
+
+        @property
+        def x(self) -> 'np.ndarray':
+            return self.data[:, 0]
+
+        @x.setter
+        def x(self, value):
+            self.data[:, 0] = value
+
+        @property
+        def y(self) -> 'np.ndarray':
+            return self.data[:, 1]
+
+        @y.setter
+        def y(self, value):
+            self.data[:, 1] = value
+
+        def cross(self, other) -> 'np.ndarray':
+            other_arr = np.broadcast_to(__get_array_from_other__(self._DIM, other), self.data.shape)
+            return self.data[:, 0] * other_arr[:, 1] - self.data[:, 1] * other_arr[:, 0]
+
+        def rotate(self, theta) -> 'Vector2Array':
+            return self.copy().rotate_inplace(theta)
+
+        def rotate_inplace(self, theta) -> 'Vector2Array':
+            cos_t = np.cos(theta)
+            sin_t = np.sin(theta)
+
+            x = self.data[:, 0].copy()
+            y = self.data[:, 1]
+
+            self.data[:, 0] = x * cos_t - y * sin_t
+            self.data[:, 1] = x * sin_t + y * cos_t
+
+            return self
+
+
+    class Vector3Array(VectorArrayBase):
+        _DIM = 3
+        _VECTOR_TYPE = Vector3
+
+        @property
+        def x(self) -> 'np.ndarray':
+            return self.data[:, 0]
+
+        @x.setter
+        def x(self, value):
+            self.data[:, 0] = value
+
+        @property
+        def y(self) -> 'np.ndarray':
+            return self.data[:, 1]
+
+        @y.setter
+        def y(self, value):
+            self.data[:, 1] = value
+
+        @property
+        def z(self) -> 'np.ndarray':
+            return self.data[:, 2]
+
+        @z.setter
+        def z(self, value):
+            self.data[:, 2] = value
+
+        def cross(self, other) -> 'Vector3Array':
+            other_arr = np.broadcast_to(__get_array_from_other__(self._DIM, other), self.data.shape)
+            return Vector3Array(np.cross(self.data, other_arr))
+
+        def rotate(self, rotation) -> 'Vector3Array':
+            return Vector3Array(self.data @ __get_rotation_matrix__(rotation).T)
+
+        def rotate_inplace(self, rotation) -> 'Vector3Array':
+            self.data[:] = self.data @ __get_rotation_matrix__(rotation).T
+            return self
+
+except ImportError:
+    class VectorArrayBase:
+        def __init__(self, *args, **kwargs):
+            raise ImportError('numpy is not installed')
+
+
+    class Vector2Array(VectorArrayBase):
+        pass
+
+
+    class Vector3Array(VectorArrayBase):
+        pass
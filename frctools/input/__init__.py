@@ -1,8 +1,12 @@
-from .input import XboxControllerInput, Input, PowerTransform
+from .input import XboxControllerInput, Input, PowerTransform, JoystickSnapshot
+from .recording import InputRecorder, InputReplay
 
 
 __all__ = [
     'XboxControllerInput',
     'Input',
-    'PowerTransform'
+    'PowerTransform',
+    'JoystickSnapshot',
+    'InputRecorder',
+    'InputReplay'
 ]
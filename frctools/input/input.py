@@ -1,7 +1,8 @@
 import math
-from typing import Dict, Union
+from typing import Dict, List, Sequence, Tuple, Union
 from enum import Enum
 
+import hal
 import wpilib
 import wpiutil
 from wpilib import Joystick
@@ -40,6 +41,84 @@ class PowerTransform:
         return self.evaluate(value)
 
 
+class JoystickSnapshot:
+    # State of a joystick read once per frame: the axes, the button bitmask and the POVs are each one HAL call.
+    # The HAL structs are reused every frame, the memoryviews over their arrays stay valid between refreshes.
+    def __init__(self, joystick_id: int):
+        self.joystick_id = joystick_id
+
+        self.__axes = hal.JoystickAxes()
+        self.__buttons = hal.JoystickButtons()
+        self.__povs = hal.JoystickPOVs()
+
+        self.__axes_values = self.__axes.axes
+        self.__povs_values = self.__povs.povs
+
+        self.__axis_count = 0
+        self.__pov_count = 0
+        self.__button_bits = 0
+        self.__button_count = 0
+
+        # While overridden (ex: input replay) the snapshot keeps the values it was given instead of reading the HAL
+        self.__overridden = False
+
+    def refresh(self):
+        if self.__overridden:
+            return
+
+        hal.getJoystickAxes(self.joystick_id, self.__axes)
+        hal.getJoystickButtons(self.joystick_id, self.__buttons)
+        hal.getJoystickPOVs(self.joystick_id, self.__povs)
+
+        self.__axis_count = self.__axes.count
+        self.__pov_count = self.__povs.count
+        self.__button_bits = self.__buttons.buttons
+        self.__button_count = self.__buttons.count
+
+    def get_axis(self, axis: int) -> float:
+        if axis >= self.__axis_count:
+            return 0.
+
+        return self.__axes_values[axis]
+
+    def get_button(self, button: int) -> bool:
+        # Buttons are 1-indexed like Joystick.getRawButton
+        if button > self.__button_count:
+            return False
+
+        return (self.__button_bits >> (button - 1)) & 1 == 1
+
+    def get_buttons(self) -> int:
+        return self.__button_bits
+
+    def get_pov(self, pov: int = 0) -> int:
+        if pov >= self.__pov_count:
+            return -1
+
+        return self.__povs_values[pov]
+
+    def get_state(self) -> Tuple[int, Sequence[float], int, int, int, Sequence[int]]:
+        return (self.__axis_count, self.__axes_values,
+                self.__button_count, self.__button_bits,
+                self.__pov_count, self.__povs_values)
+
+    def override(self, axis_count: int, axes: Sequence[float], button_count: int, buttons: int, pov_count: int, povs: Sequence[int]):
+        self.__overridden = True
+
+        self.__axis_count = axis_count
+        self.__axes_values = axes
+        self.__button_count = button_count
+        self.__button_bits = buttons
+        self.__pov_count = pov_count
+        self.__povs_values = povs
+
+    def release(self):
+        self.__overridden = False
+
+        self.__axes_values = self.__axes.axes
+        self.__povs_values = self.__povs.povs
+
+
 class Input(wpiutil.Sendable):
     BUTTON_MODE = 0
     AXIS_MODE = 1
@@ -48,8 +127,15 @@ class Input(wpiutil.Sendable):
     __COROUTINE__: Coroutine
 
     __joysticks__: Dict[int, Joystick] = {}
+    __snapshots__: Dict[int, JoystickSnapshot] = {}
     __inputs__: Dict[str, 'Input'] = {}
 
+    # Inputs in evaluation order, the composite axes come after the inputs they depend on
+    __order__: List['Input'] = []
+
+    __recorder__ = None
+    __replay__ = None
+
     def __init__(self, name: str,
                  joystick_id: int = -1,
                  input_id: str = None,
@@ -69,6 +155,8 @@ class Input(wpiutil.Sendable):
             # If the joystick hasn't been initialized yet, initialize it.
             if joystick_id not in Input.__joysticks__:
                 Input.__joysticks__[joystick_id] = Joystick(joystick_id)
+                Input.__snapshots__[joystick_id] = JoystickSnapshot(joystick_id)
+            self.__snapshot = Input.__snapshots__[joystick_id]
 
             # Input IDs are formatted either as
             #   '{mode}.{id}' ex:('button.1' or 'axis.1') or
@@ -156,20 +244,20 @@ class Input(wpiutil.Sendable):
 
     def __get_button__(self) -> bool:
         if self.__irl_mode__ == Input.BUTTON_MODE:
-            return Input.__joysticks__[self.joystick_id].getRawButton(self.input_id)
+            return self.__snapshot.get_button(self.input_id)
 
-        value = Input.__joysticks__[self.joystick_id].getRawAxis(self.input_id)
+        value = self.__snapshot.get_axis(self.input_id)
         value *= -1 if self.invert else 1
 
         return value > self.cutoff
 
     def __get_axis__(self) -> float:
         if self.__irl_mode__ == Input.AXIS_MODE:
-            value = Input.__joysticks__[self.joystick_id].getRawAxis(self.input_id)
+            value = self.__snapshot.get_axis(self.input_id)
             value = frcmath.deadzone(value, self.deadzone)
             value = -value if self.invert else value
         else:
-            value = Input.__joysticks__[self.joystick_id].getRawButton(self.input_id)
+            value = self.__snapshot.get_button(self.input_id)
             value = value if value != self.invert else 0.
 
         return value
@@ -195,7 +283,16 @@ class Input(wpiutil.Sendable):
     @staticmethod
     def __input_coroutine__():
         while True:
-            for inp in Input.__inputs__.values():
+            if Input.__replay__ is not None and not Input.__replay__.apply(Input.__snapshots__):
+                Input.stop_replay()
+
+            for snapshot in Input.__snapshots__.values():
+                snapshot.refresh()
+
+            if Input.__recorder__ is not None:
+                Input.__recorder__.record(Input.__snapshots__)
+
+            for inp in Input.__order__:
                 inp.__last_value = inp.__current_value
 
                 if inp.mode == Input.AXIS_MODE:
@@ -207,6 +304,66 @@ class Input(wpiutil.Sendable):
 
             yield None
 
+    @classmethod
+    def __add_input__(cls, inp: 'Input'):
+        cls.__inputs__[inp.name] = inp
+
+        # Depth first so every composite axis is placed after its positive and negative inputs
+        order = []
+        visited = set()
+
+        def visit(i: 'Input'):
+            if i in visited:
+                return
+            visited.add(i)
+
+            if i.mode == Input.COMPOSITE_AXIS_MODE:
+                visit(i.positive)
+                visit(i.negative)
+
+            if i.name in cls.__inputs__:
+                order.append(i)
+
+        for i in cls.__inputs__.values():
+            visit(i)
+
+        Input.__order__ = order
+
+    @classmethod
+    def get_snapshot(cls, joystick_id: int) -> JoystickSnapshot:
+        return cls.__snapshots__[joystick_id]
+
+    @classmethod
+    def start_recording(cls, path: str):
+        from .recording import InputRecorder
+
+        cls.stop_recording()
+        Input.__recorder__ = InputRecorder(path, cls.__snapshots__)
+
+    @classmethod
+    def stop_recording(cls):
+        if Input.__recorder__ is not None:
+            Input.__recorder__.close()
+            Input.__recorder__ = None
+
+    @classmethod
+    def start_replay(cls, path: str):
+        from .recording import InputReplay
+
+        cls.stop_replay()
+        Input.__replay__ = InputReplay(path)
+
+    @classmethod
+    def stop_replay(cls):
+        Input.__replay__ = None
+
+        for snapshot in cls.__snapshots__.values():
+            snapshot.release()
+
+    @classmethod
+    def is_replaying(cls) -> bool:
+        return Input.__replay__ is not None
+
     @classmethod
     def add_button(cls,
                    name: str,
@@ -216,7 +373,7 @@ class Input(wpiutil.Sendable):
             raise KeyError(f'Input "{name}" already exists.')
 
         button = cls(name, joystick_id, input_id, mode=cls.BUTTON_MODE)
-        cls.__inputs__[name] = button
+        cls.__add_input__(button)
 
         return button
 
@@ -233,7 +390,7 @@ class Input(wpiutil.Sendable):
             raise KeyError(f'Input "{name}" already exists.')
 
         axis = cls(name, joystick_id, input_id, mode=cls.AXIS_MODE, inverted=inverted, deadzone=deadzone, axis_filter=axis_filter, axis_transform=axis_transform)
-        cls.__inputs__[name] = axis
+        cls.__add_input__(axis)
 
         return axis
 
@@ -248,7 +405,7 @@ class Input(wpiutil.Sendable):
             raise KeyError(f'Input "{name}" already exists.')
 
         composite = cls(name, mode=Input.COMPOSITE_AXIS_MODE, positive=positive, negative=negative, axis_filter=axis_filter, axis_transform=axis_transform)
-        cls.__inputs__[name] = composite
+        cls.__add_input__(composite)
 
         return composite
 
@@ -0,0 +1,112 @@
+from typing import Dict, List, Tuple
+
+import struct
+
+
+# Every frame is one fixed-size record: the frame number followed by the snapshot of every recorded joystick
+#   axis count, 12 axes, button count, button bitmask, pov count, 12 povs
+MAGIC = b'FRCI'
+VERSION = 1
+
+HEADER = struct.Struct('<4sBB')
+JOYSTICK_ID = struct.Struct('<B')
+MAX_AXES = 12
+MAX_POVS = 12
+JOYSTICK_FORMAT = f'B{MAX_AXES}fBIB{MAX_POVS}h'
+
+
+def __record_struct__(joystick_count: int) -> struct.Struct:
+    return struct.Struct('<I' + JOYSTICK_FORMAT * joystick_count)
+
+
+class InputRecorder:
+    def __init__(self, path: str, snapshots: Dict):
+        self.__joystick_ids = list(snapshots.keys())
+        self.__record = __record_struct__(len(self.__joystick_ids))
+
+        # Counted by the recorder, one per record call. The Timer frame count goes back to 0 on Timer.reset
+        # (ex: when the robot is enabled) and can not be used to number the records.
+        self.__frame = 0
+
+        self.__file = open(path, 'wb')
+        self.__file.write(HEADER.pack(MAGIC, VERSION, len(self.__joystick_ids)))
+        for joystick_id in self.__joystick_ids:
+            self.__file.write(JOYSTICK_ID.pack(joystick_id))
+
+    def record(self, snapshots: Dict):
+        values = [self.__frame]
+        self.__frame += 1
+        for joystick_id in self.__joystick_ids:
+            axis_count, axes, button_count, buttons, pov_count, povs = snapshots[joystick_id].get_state()
+
+            values.append(axis_count)
+            values.extend(axes[i] if i < axis_count else 0. for i in range(MAX_AXES))
+            values.append(button_count)
+            values.append(buttons)
+            values.append(pov_count)
+            values.extend(povs[i] if i < pov_count else 0 for i in range(MAX_POVS))
+
+        self.__file.write(self.__record.pack(*values))
+
+    def close(self):
+        self.__file.close()
+
+
+class InputReplay:
+    def __init__(self, path: str):
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        magic, version, joystick_count = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'"{path}" is not an input recording.')
+
+        offset = HEADER.size
+        self.__joystick_ids = []
+        for _ in range(joystick_count):
+            self.__joystick_ids.append(JOYSTICK_ID.unpack_from(data, offset)[0])
+            offset += JOYSTICK_ID.size
+
+        # Every record is split once at load time into (frame, [joystick state, ...])
+        record = __record_struct__(joystick_count)
+        field_count = 5 + MAX_AXES + MAX_POVS
+
+        # A partial last record (ex: the robot was powered off while recording) is dropped
+        body = data[offset:]
+        body = body[:len(body) - len(body) % record.size]
+
+        self.__records: List[Tuple[int, list]] = []
+        for values in record.iter_unpack(body):
+            states = []
+            for j in range(joystick_count):
+                v = values[1 + j * field_count:1 + (j + 1) * field_count]
+                states.append((v[0], v[1:1 + MAX_AXES],
+                               v[1 + MAX_AXES], v[2 + MAX_AXES],
+                               v[3 + MAX_AXES], v[4 + MAX_AXES:]))
+
+            self.__records.append((values[0], states))
+
+        self.__index = 0
+
+        # Counted by the replay, one per apply call, see InputRecorder
+        self.__frame = 0
+
+    def get_frame_count(self) -> int:
+        return len(self.__records)
+
+    def apply(self, snapshots: Dict) -> bool:
+        # Frames are relative to the start of the recording and of the replay, returns False once the replay is over
+        frame = self.__frame
+        self.__frame += 1
+
+        while self.__index < len(self.__records) - 1 and self.__records[self.__index + 1][0] <= frame:
+            self.__index += 1
+
+        if self.__index >= len(self.__records) or self.__records[-1][0] < frame:
+            return False
+
+        for joystick_id, state in zip(self.__joystick_ids, self.__records[self.__index][1]):
+            if joystick_id in snapshots:
+                snapshots[joystick_id].override(*state)
+
+        return True
@@ -1,3 +1,8 @@
+from .timer import FrameCache
+
+from typing import Dict, List
+
+
 class MotorGroup:
     def __init__(self, positives=None, negatives=None):
         self.positives = [] if positives is None else positives
@@ -12,7 +17,7 @@ class MotorGroup:
 
 
 try:
-    from rev import SparkBase, SparkBaseConfig, SparkMax, SparkMaxConfig, SparkFlex, SparkFlexConfig, ResetMode, PersistMode
+    from rev import SparkBase, SparkBaseConfig, SparkMax, SparkMaxConfig, SparkFlex, SparkFlexConfig, ResetMode, PersistMode, ClosedLoopConfig
 
 
     def __motor_type_from_bool__(b: bool) -> SparkBase.MotorType:
@@ -21,50 +26,145 @@ try:
     def __brake_from_bool__(b: bool) -> SparkBaseConfig.IdleMode:
         return SparkBaseConfig.IdleMode.kBrake if b else SparkBaseConfig.IdleMode.kCoast
 
+    def __configure_position_control__(config: SparkBaseConfig, p: float, i: float, d: float, offset: float, sensor_inverted: bool):
+        config.absoluteEncoder.zeroOffset(offset % 1.).inverted(sensor_inverted)
+        config.closedLoop.setFeedbackSensor(ClosedLoopConfig.FeedbackSensor.kAbsoluteEncoder) \
+                         .pid(p, i, d) \
+                         .positionWrappingEnabled(True) \
+                         .positionWrappingInputRange(0., 1.)
+
+    def __configure_velocity_control__(config: SparkBaseConfig, p: float, i: float, d: float, ff: float):
+        config.closedLoop.setFeedbackSensor(ClosedLoopConfig.FeedbackSensor.kPrimaryEncoder) \
+                         .pid(p, i, d) \
+                         .velocityFF(ff)
+
+
+    class __SparkConfig__:
+        # Keeps the configuration last applied to a Spark, a value equal to the applied one is not sent again.
+        # The changes made between defer() and apply() are sent in a single configure call holding only the changed
+        # parameters. Runtime changes (persist=False) are not written to the flash and the loop does not wait for them.
+        __SETTERS = {
+            'brake': lambda config, brake: config.setIdleMode(__brake_from_bool__(brake)),
+            'position_conversion_factor': lambda config, factor: config.encoder.positionConversionFactor(factor),
+            'position_control': lambda config, args: __configure_position_control__(config, *args),
+            'velocity_control': lambda config, args: __configure_velocity_control__(config, *args)
+        }
+
+        def __init__(self, spark: SparkBase, config_type):
+            self.__spark = spark
+            self.__config_type = config_type
+
+            self.__applied = {}
+            self.__pending = {}
+            self.__persist = False
+            self.__deferred = False
+
+        def get(self, key: str, default=None):
+            return self.__pending.get(key, self.__applied.get(key, default))
+
+        def set(self, key: str, value, persist: bool = True):
+            if key not in self.__pending and key in self.__applied and self.__applied[key] == value:
+                return
+
+            self.__pending[key] = value
+            self.__persist = self.__persist or persist
+
+            if not self.__deferred:
+                self.apply()
+
+        def defer(self):
+            self.__deferred = True
+
+        def apply(self, reset: bool = False):
+            # reset restores the safe parameters to their default first, every known value is then sent again
+            self.__deferred = False
+            if len(self.__pending) == 0 and not reset:
+                return
+
+            values = {**self.__applied, **self.__pending} if reset else self.__pending
+
+            config = self.__config_type()
+            for key, value in values.items():
+                __SparkConfig__.__SETTERS[key](config, value)
+
+            if reset:
+                self.__spark.configure(config, ResetMode.kResetSafeParameters, PersistMode.kPersistParameters)
+            elif self.__persist:
+                self.__spark.configure(config, ResetMode.kNoResetSafeParameters, PersistMode.kPersistParameters)
+            else:
+                self.__spark.configureAsync(config, ResetMode.kNoResetSafeParameters, PersistMode.kNoPersistParameters)
+
+            self.__applied.update(self.__pending)
+            self.__pending.clear()
+            self.__persist = False
+
 
     class WPI_CANSparkMax(SparkMax):
         def __init__(self, can_id: int, brushless: bool, brake: bool = False, inverted: bool = False):
             super().__init__(can_id, __motor_type_from_bool__(brushless))
 
             self.__encoder = self.getEncoder()
+            self.__controller = self.getClosedLoopController()
             self.__inverted = inverted
 
-            self.__config = SparkMaxConfig()
-            self.__config.setIdleMode(__brake_from_bool__(brake))
+            # The reads are cached for the loop, pass fresh=True to read the device again
+            self.__position = FrameCache(self.__encoder.getPosition)
+            self.__velocity = FrameCache(self.__encoder.getVelocity)
+            self.__bus_voltage = FrameCache(self.getBusVoltage)
 
-            self.__apply_config__()
+            self.__config = __SparkConfig__(self, SparkMaxConfig)
+            self.__config.defer()
+            self.__config.set('brake', brake)
+            self.__config.apply(reset=True)
 
-        def get_position(self) -> float:
-            return self.__encoder.getPosition()
+        def get_position(self, fresh: bool = False) -> float:
+            return self.__position.get_fresh() if fresh else self.__position.get()
         def set_position(self, position: float):
             self.__encoder.setPosition(position)
+            self.__position.invalidate()
         def set_position_conversion_factor(self, conversion_factor: float):
-            self.__config.encoder.positionConversionFactor(conversion_factor)
-            self.__apply_config__()
+            self.__config.set('position_conversion_factor', conversion_factor)
+            self.__position.invalidate()
 
         def set(self, speed: float):
             super().set(speed * (-1 if self.__inverted else 1))
-        def get(self) -> float:
-            return self.__encoder.getVelocity()
+        def get(self, fresh: bool = False) -> float:
+            return self.__velocity.get_fresh() if fresh else self.__velocity.get()
 
-        def get_voltage(self) -> float:
-            return self.getBusVoltage()
+        def get_voltage(self, fresh: bool = False) -> float:
+            return self.__bus_voltage.get_fresh() if fresh else self.__bus_voltage.get()
         def set_voltage(self, voltage: float):
             self.setVoltage(voltage * (-1 if self.__inverted else 1))
 
         def get_brake(self) -> bool:
-            return self.configAccessor.getIdleMode() == SparkBase.IdleMode.kBrake
-        def set_brake(self, brake: bool):
-            self.__config.setIdleMode(__brake_from_bool__(brake))
-            self.__apply_config__()
+            return self.__config.get('brake')
+        def set_brake(self, brake: bool, persist: bool = False):
+            # Usually toggled at runtime (e.g. coast when disabled), not written to the flash by default
+            self.__config.set('brake', brake, persist)
 
         def get_inverted(self) -> bool:
             return self.__inverted
         def set_inverted(self, inverted: bool):
             self.__inverted = inverted
 
-        def __apply_config__(self):
-            self.configure(self.__config, ResetMode.kResetSafeParameters, PersistMode.kPersistParameters)
+        def set_position_control(self, p: float, i: float = 0., d: float = 0., offset: float = 0., sensor_inverted: bool = False):
+            # Position loop running on the controller at 1 kHz, using the absolute encoder plugged in the controller.
+            # The offset is in rotations, the position wraps between 0 and 1 so the shortest way is always taken.
+            self.__config.set('position_control', (p, i, d, offset, sensor_inverted))
+        def set_position_target(self, position: float):
+            self.__controller.setReference(position, SparkBase.ControlType.kPosition)
+
+        def set_velocity_control(self, p: float, i: float = 0., d: float = 0., ff: float = 0.):
+            # Velocity loop running on the controller, using the built-in encoder and its velocity conversion factor
+            self.__config.set('velocity_control', (p, i, d, ff))
+        def set_velocity_target(self, velocity: float):
+            self.__controller.setReference(velocity * (-1 if self.__inverted else 1), SparkBase.ControlType.kVelocity)
+
+        def defer_config(self):
+            # The configuration changes are kept until apply_config, then sent together
+            self.__config.defer()
+        def apply_config(self):
+            self.__config.apply()
 
 
     class WPI_CANSparkFlex(SparkFlex):
@@ -72,44 +172,67 @@ try:
             super().__init__(can_id, __motor_type_from_bool__(brushless))
 
             self.__encoder = self.getEncoder()
+            self.__controller = self.getClosedLoopController()
             self.__inverted = inverted
 
-            self.__config = SparkFlexConfig()
-            self.__config.setIdleMode(__brake_from_bool__(brake))
+            # The reads are cached for the loop, pass fresh=True to read the device again
+            self.__position = FrameCache(self.__encoder.getPosition)
+            self.__velocity = FrameCache(self.__encoder.getVelocity)
+            self.__bus_voltage = FrameCache(self.getBusVoltage)
 
-            self.__apply_config__()
+            self.__config = __SparkConfig__(self, SparkFlexConfig)
+            self.__config.defer()
+            self.__config.set('brake', brake)
+            self.__config.apply(reset=True)
 
-        def get_position(self) -> float:
-            return self.__encoder.getPosition()
+        def get_position(self, fresh: bool = False) -> float:
+            return self.__position.get_fresh() if fresh else self.__position.get()
         def set_position(self, position: float):
             self.__encoder.setPosition(position)
+            self.__position.invalidate()
         def set_position_conversion_factor(self, conversion_factor: float):
-            self.__config.encoder.positionConversionFactor(conversion_factor)
-            self.__apply_config__()
+            self.__config.set('position_conversion_factor', conversion_factor)
+            self.__position.invalidate()
 
-        def get(self) -> float:
-            return self.__encoder.getVelocity()
+        def get(self, fresh: bool = False) -> float:
+            return self.__velocity.get_fresh() if fresh else self.__velocity.get()
         def set(self, speed: float):
             super().set(speed * (-1 if self.__inverted else 1))
 
-        def get_voltage(self) -> float:
-            return self.getBusVoltage()
+        def get_voltage(self, fresh: bool = False) -> float:
+            return self.__bus_voltage.get_fresh() if fresh else self.__bus_voltage.get()
         def set_voltage(self, voltage: float):
             self.setVoltage(voltage * (-1 if self.__inverted else 1))
 
         def get_brake(self) -> bool:
-            return self.configAccessor.getIdleMode() == SparkBase.IdleMode.kBrake
-        def set_brake(self, brake: bool):
-            self.__config.setIdleMode(__brake_from_bool__(brake))
-            self.__apply_config__()
+            return self.__config.get('brake')
+        def set_brake(self, brake: bool, persist: bool = False):
+            # Usually toggled at runtime (e.g. coast when disabled), not written to the flash by default
+            self.__config.set('brake', brake, persist)
 
         def get_inverted(self) -> bool:
             return self.__inverted
         def set_inverted(self, inverted: bool):
             self.__inverted = inverted
 
-        def __apply_config__(self):
-            self.configure(self.__config, ResetMode.kResetSafeParameters, PersistMode.kPersistParameters)
+        def set_position_control(self, p: float, i: float = 0., d: float = 0., offset: float = 0., sensor_inverted: bool = False):
+            # Position loop running on the controller at 1 kHz, using the absolute encoder plugged in the controller.
+            # The offset is in rotations, the position wraps between 0 and 1 so the shortest way is always taken.
+            self.__config.set('position_control', (p, i, d, offset, sensor_inverted))
+        def set_position_target(self, position: float):
+            self.__controller.setReference(position, SparkBase.ControlType.kPosition)
+
+        def set_velocity_control(self, p: float, i: float = 0., d: float = 0., ff: float = 0.):
+            # Velocity loop running on the controller, using the built-in encoder and its velocity conversion factor
+            self.__config.set('velocity_control', (p, i, d, ff))
+        def set_velocity_target(self, velocity: float):
+            self.__controller.setReference(velocity * (-1 if self.__inverted else 1), SparkBase.ControlType.kVelocity)
+
+        def defer_config(self):
+            # The configuration changes are kept until apply_config, then sent together
+            self.__config.defer()
+        def apply_config(self):
+            self.__config.apply()
 
 except ImportError:
     class WPI_CANSparkMax:
@@ -122,13 +245,63 @@ except ImportError:
 
 
 try:
-    from phoenix6.hardware import TalonFX
-    from phoenix6.controls import VelocityDutyCycle, VoltageOut
-    from phoenix6.configs import TalonFXConfiguration
+    from phoenix6 import BaseStatusSignal
+    from phoenix6.hardware import TalonFX, CANcoder
+    from phoenix6.controls import VelocityDutyCycle, VoltageOut, PositionVoltage, VelocityVoltage
+    from phoenix6.configs import TalonFXConfiguration, CANcoderConfiguration
     from phoenix6.configs.talon_fx_configs import NeutralModeValue, InvertedValue
+    from phoenix6.signals import FeedbackSensorSourceValue, SensorDirectionValue
+
+
+    class MotorStatusBus:
+        # Every registered status signal is refreshed by one batched call at the start of the robot loop.
+        # The devices are read in a single round-trip and every module sees values from the same instant.
+        __SIGNALS: List[BaseStatusSignal] = []
+        __FREQUENCY = 100.
+        __TIMEOUT: float = None
+
+        @staticmethod
+        def register(*signals: BaseStatusSignal):
+            BaseStatusSignal.set_update_frequency_for_all(MotorStatusBus.__FREQUENCY, *signals)
+            MotorStatusBus.__SIGNALS.extend(signals)
+
+            # Read once now, a value used before the first loop (e.g. to seed odometry) is not the default one
+            BaseStatusSignal.refresh_all(*signals)
+
+        @staticmethod
+        def set_update_frequency(frequency: float):
+            # Frequency (Hz) the devices send the registered signals at, should be faster than the robot loop
+            MotorStatusBus.__FREQUENCY = frequency
+
+            if len(MotorStatusBus.__SIGNALS) > 0:
+                BaseStatusSignal.set_update_frequency_for_all(frequency, *MotorStatusBus.__SIGNALS)
+
+        @staticmethod
+        def set_synchronous(timeout: float = None):
+            # With a timeout (s) the refresh waits until every signal received a new value, the values are then
+            # time-aligned across the devices. With None the refresh only takes the latest values without blocking.
+            MotorStatusBus.__TIMEOUT = timeout
+
+        @staticmethod
+        def get_signal_count() -> int:
+            return len(MotorStatusBus.__SIGNALS)
+
+        @staticmethod
+        def refresh():
+            signals = MotorStatusBus.__SIGNALS
+            if len(signals) == 0:
+                return
+
+            if MotorStatusBus.__TIMEOUT is None:
+                BaseStatusSignal.refresh_all(*signals)
+            else:
+                BaseStatusSignal.wait_for_all(MotorStatusBus.__TIMEOUT, *signals)
 
 
     class WPI_TalonFX(TalonFX):
+        # Groups of the configuration tracked by apply_config, a group is only sent when it changed since its last apply
+        __CONFIG_GROUPS = ('motor_output', 'feedback', 'closed_loop_general', 'slot0')
+
         def __init__(self, can_id: int, brake: bool = False, inverted: bool = False):
             super().__init__(can_id)
 
@@ -136,38 +309,128 @@ try:
             self.configurator.refresh(self.config)
 
             self.config.motor_output.neutral_mode = WPI_TalonFX.__brake_from_bool__(brake)
-            self.config.inverted = WPI_TalonFX.__inverted_from_bool__(inverted)
+            self.config.motor_output.inverted = WPI_TalonFX.__inverted_from_bool__(inverted)
+
+            self.__applied_groups: Dict[str, str] = {}
+            self.__pending_groups = set()
+            self.__blocking = False
+            self.__deferred = False
 
             self.__duty_cycle_out = VelocityDutyCycle(0, enable_foc=False)
             self.__voltage_out = VoltageOut(0, enable_foc=False)
-
-            self.configurator.apply(self.config)
+            self.__position_out = PositionVoltage(0, enable_foc=False)
+            self.__velocity_out = VelocityVoltage(0, enable_foc=False)
+
+            # Refreshed by the MotorStatusBus at the start of every loop, pass fresh=True to read the device again.
+            # The phoenix6 getters (get_position, get_velocity, ...) are left untouched and still return the signals.
+            self.__velocity = self.get_velocity(False)
+            self.__position = self.get_position(False)
+            self.__motor_voltage = self.get_motor_voltage(False)
+            self.__stator_current = self.get_stator_current(False)
+            MotorStatusBus.register(self.__velocity, self.__position, self.__motor_voltage, self.__stator_current)
+
+            self.__pending_groups.update(WPI_TalonFX.__CONFIG_GROUPS)
+            self.__apply_config__()
             self.set_control(self.__voltage_out)
 
         def set(self, value: float):
             self.set_control(self.__duty_cycle_out.with_velocity(value))
 
-        def get(self) -> float:
-            return self.get_velocity().value
+        def get(self, fresh: bool = False) -> float:
+            return (self.__velocity.refresh() if fresh else self.__velocity).value
+
+        def get_position_value(self, fresh: bool = False) -> float:
+            return (self.__position.refresh() if fresh else self.__position).value
+
+        def get_current_value(self, fresh: bool = False) -> float:
+            return (self.__stator_current.refresh() if fresh else self.__stator_current).value
 
         def set_voltage(self, voltage: float):
             self.set_control(self.__voltage_out.with_output(voltage))
 
-        def get_voltage(self) -> float:
-            return self.get_motor_voltage().value
+        def get_voltage(self, fresh: bool = False) -> float:
+            return (self.__motor_voltage.refresh() if fresh else self.__motor_voltage).value
 
-        def set_brake(self, brake: bool):
-            self.configurator.apply(self.config.with_motor_output(self.config.motor_output.with_neutral_mode(WPI_TalonFX.__brake_from_bool__(brake))))
+        def set_brake(self, brake: bool, persist: bool = False):
+            # Usually toggled at runtime (e.g. coast when disabled), the loop does not wait for the device by default
+            self.config.motor_output.neutral_mode = WPI_TalonFX.__brake_from_bool__(brake)
+            self.__apply_config__('motor_output', blocking=persist)
 
         def get_brake(self) -> bool:
             return self.config.motor_output.neutral_mode == NeutralModeValue.BRAKE
 
         def set_inverted(self, inverted: bool):
-            self.configurator.apply(self.config.with_motor_output(self.config.motor_output.with_inverted(WPI_TalonFX.__inverted_from_bool__(inverted))))
+            self.config.motor_output.inverted = WPI_TalonFX.__inverted_from_bool__(inverted)
+            self.__apply_config__('motor_output')
 
         def get_inverted(self) -> bool:
             return self.config.motor_output.inverted == InvertedValue.COUNTER_CLOCKWISE_POSITIVE
 
+        def set_position_control(self, p: float, i: float = 0., d: float = 0., offset: float = 0., sensor_inverted: bool = False, *, cancoder_id: int):
+            # Position loop running on the controller at 1 kHz, using the CANcoder with the given CAN id as remote sensor.
+            # The offset is in rotations and is pushed in the CANcoder, the position wraps between 0 and 1.
+            cancoder_config = CANcoderConfiguration()
+            cancoder_config.magnet_sensor.magnet_offset = -(offset % 1.)
+            cancoder_config.magnet_sensor.absolute_sensor_discontinuity_point = 1.
+            cancoder_config.magnet_sensor.sensor_direction = SensorDirectionValue.CLOCKWISE_POSITIVE if sensor_inverted else SensorDirectionValue.COUNTER_CLOCKWISE_POSITIVE
+            CANcoder(cancoder_id, self.network).configurator.apply(cancoder_config)
+
+            self.config.feedback.feedback_remote_sensor_id = cancoder_id
+            self.config.feedback.feedback_sensor_source = FeedbackSensorSourceValue.REMOTE_CANCODER
+            self.config.closed_loop_general.continuous_wrap = True
+            self.config.slot0.k_p = p
+            self.config.slot0.k_i = i
+            self.config.slot0.k_d = d
+
+            self.__apply_config__('feedback', 'closed_loop_general', 'slot0')
+
+        def set_position_target(self, position: float):
+            self.set_control(self.__position_out.with_position(position))
+
+        def set_velocity_control(self, p: float, i: float = 0., d: float = 0., ff: float = 0.):
+            # Velocity loop running on the controller, in rotor rotations per second
+            self.config.feedback.feedback_sensor_source = FeedbackSensorSourceValue.ROTOR_SENSOR
+            self.config.slot0.k_p = p
+            self.config.slot0.k_i = i
+            self.config.slot0.k_d = d
+            self.config.slot0.k_v = ff
+
+            self.__apply_config__('feedback', 'slot0')
+
+        def set_velocity_target(self, velocity: float):
+            self.set_control(self.__velocity_out.with_velocity(velocity))
+
+        def defer_config(self):
+            # The configuration changes are kept until apply_config, then sent together
+            self.__deferred = True
+
+        def apply_config(self):
+            self.__deferred = False
+
+            changed = [name for name in self.__pending_groups
+                       if str(getattr(self.config, name)) != self.__applied_groups.get(name)]
+            timeout = 0.1 if self.__blocking else 0.
+
+            # A single changed group is sent alone, several are coalesced in one apply of the whole configuration
+            if len(changed) == 1:
+                self.configurator.apply(getattr(self.config, changed[0]), timeout)
+            elif len(changed) > 1:
+                self.configurator.apply(self.config, timeout)
+                changed = WPI_TalonFX.__CONFIG_GROUPS
+
+            for name in changed:
+                self.__applied_groups[name] = str(getattr(self.config, name))
+
+            self.__pending_groups.clear()
+            self.__blocking = False
+
+        def __apply_config__(self, *groups: str, blocking: bool = True):
+            self.__pending_groups.update(groups)
+            self.__blocking = self.__blocking or blocking
+
+            if not self.__deferred:
+                self.apply_config()
+
         @staticmethod
         def __brake_from_bool__(b):
             return NeutralModeValue.BRAKE if b else NeutralModeValue.COAST
@@ -180,4 +443,25 @@ except ImportError:
         def __init__(self, *args, **kwargs):
             raise NotImplementedError("phoenix6 library is not installed")
 
+    class MotorStatusBus:
+        @staticmethod
+        def register(*signals):
+            raise NotImplementedError("phoenix6 library is not installed")
+
+        @staticmethod
+        def set_update_frequency(frequency: float):
+            pass
+
+        @staticmethod
+        def set_synchronous(timeout: float = None):
+            pass
+
+        @staticmethod
+        def get_signal_count() -> int:
+            return 0
+
+        @staticmethod
+        def refresh():
+            pass
+
 
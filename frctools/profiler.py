@@ -0,0 +1,181 @@
+from .timer import Timer, CoroutineOrder, Coroutine
+
+from array import array
+from typing import Dict
+
+import ntcore
+
+
+class ProfilerChannel:
+    # Durations are kept in nanoseconds in a preallocated ring buffer, the getters return seconds
+    def __init__(self, name: str, size: int = 256, budget: float = None):
+        self.name = name
+
+        self.__samples = array('q', bytes(8 * size))
+        self.__index = 0
+        self.__count = 0
+
+        self.__budget_ns = None
+        self.__overruns = 0
+        self.set_budget(budget)
+
+    def record(self, duration_ns: int):
+        self.__samples[self.__index] = duration_ns
+
+        self.__index += 1
+        if self.__index == len(self.__samples):
+            self.__index = 0
+        if self.__count < len(self.__samples):
+            self.__count += 1
+
+        if self.__budget_ns is not None and duration_ns > self.__budget_ns:
+            self.__overruns += 1
+
+    def set_budget(self, budget: float):
+        self.__budget_ns = None if budget is None else int(budget * 1e9)
+
+    def get_count(self) -> int:
+        return self.__count
+
+    def get_overruns(self) -> int:
+        return self.__overruns
+
+    def get_last(self) -> float:
+        if self.__count == 0:
+            return 0.
+
+        return self.__samples[self.__index - 1] / 1e9
+
+    def get_min(self) -> float:
+        if self.__count == 0:
+            return 0.
+
+        return min(self.__window__()) / 1e9
+
+    def get_max(self) -> float:
+        if self.__count == 0:
+            return 0.
+
+        return max(self.__window__()) / 1e9
+
+    def get_avg(self) -> float:
+        if self.__count == 0:
+            return 0.
+
+        return sum(self.__window__()) / self.__count / 1e9
+
+    def get_percentile(self, percentile: float) -> float:
+        if self.__count == 0:
+            return 0.
+
+        values = sorted(self.__window__())
+        index = min(int(percentile / 100 * len(values)), len(values) - 1)
+
+        return values[index] / 1e9
+
+    def get_p99(self) -> float:
+        return self.get_percentile(99)
+
+    def clear(self):
+        self.__index = 0
+        self.__count = 0
+        self.__overruns = 0
+
+    def __window__(self):
+        if self.__count < len(self.__samples):
+            return self.__samples[:self.__count]
+
+        return self.__samples
+
+
+class Profiler:
+    # Off by default, when disabled the robot loop and the scheduler only pay for a flag check
+    __ENABLED = False
+
+    __CHANNELS: Dict[str, ProfilerChannel] = {}
+    __SAMPLE_COUNT = 256
+
+    __PUBLISH_PERIOD = 1.
+    __PUBLISH_COROUTINE: Coroutine = None
+
+    @staticmethod
+    def enable(publish_period: float = 1., sample_count: int = 256):
+        Profiler.__ENABLED = True
+        Profiler.__SAMPLE_COUNT = sample_count
+        Profiler.__PUBLISH_PERIOD = publish_period
+
+        Timer.set_profiler(Profiler)
+
+        if publish_period is not None:
+            Profiler.__PUBLISH_COROUTINE = Timer.start_coroutine_if_stopped(Profiler.__publish_loop__,
+                                                                            Profiler.__PUBLISH_COROUTINE,
+                                                                            CoroutineOrder.ALLWAYS,
+                                                                            True)
+
+    @staticmethod
+    def disable():
+        Profiler.__ENABLED = False
+
+        Timer.set_profiler(None)
+
+        if Profiler.__PUBLISH_COROUTINE is not None:
+            Timer.stop_coroutine(Profiler.__PUBLISH_COROUTINE)
+            Profiler.__PUBLISH_COROUTINE = None
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return Profiler.__ENABLED
+
+    @staticmethod
+    def get_channel(name: str) -> ProfilerChannel:
+        channel = Profiler.__CHANNELS.get(name)
+        if channel is None:
+            channel = ProfilerChannel(name, Profiler.__SAMPLE_COUNT)
+            Profiler.__CHANNELS[name] = channel
+
+        return channel
+
+    @staticmethod
+    def get_channels() -> Dict[str, ProfilerChannel]:
+        return Profiler.__CHANNELS
+
+    @staticmethod
+    def set_budget(name: str, budget: float):
+        Profiler.get_channel(name).set_budget(budget)
+
+    @staticmethod
+    def record(name: str, duration_ns: int):
+        Profiler.get_channel(name).record(duration_ns)
+
+    @staticmethod
+    def record_coroutine(coroutine: Coroutine, duration_ns: int):
+        # The channel is kept on the coroutine so the name lookup is only done once
+        channel = coroutine.profile_channel
+        if channel is None:
+            channel = Profiler.get_channel(f'coroutines/{coroutine.name}')
+            coroutine.profile_channel = channel
+
+        channel.record(duration_ns)
+
+    @staticmethod
+    def clear():
+        for channel in Profiler.__CHANNELS.values():
+            channel.clear()
+
+    @staticmethod
+    def publish():
+        table = ntcore.NetworkTableInstance.getDefault().getTable('frc3117/profiler')
+
+        for name, channel in Profiler.__CHANNELS.items():
+            sub_table = table.getSubTable(name)
+            sub_table.putNumber('min_ms', channel.get_min() * 1e3)
+            sub_table.putNumber('avg_ms', channel.get_avg() * 1e3)
+            sub_table.putNumber('p99_ms', channel.get_p99() * 1e3)
+            sub_table.putNumber('max_ms', channel.get_max() * 1e3)
+            sub_table.putNumber('overruns', channel.get_overruns())
+
+    @staticmethod
+    def __publish_loop__():
+        while True:
+            yield from Timer.wait_for_seconds(Profiler.__PUBLISH_PERIOD)
+            Profiler.publish()
@@ -3,10 +3,13 @@ from .input import Input
 from .component import Component
 from .autonomous import AutonomousManager
 from .networktables import HarfangsDashboard
+from .profiler import Profiler
+from .motors import MotorStatusBus
 
 from typing import Dict
 from enum import Enum
 
+import time
 import wpilib
 
 
@@ -30,14 +33,35 @@ class Alliance(str, Enum):
 class RobotBase(wpilib.TimedRobot):
     __INSTANCE__: 'RobotBase' = None
 
+    # Component hooks called by mode, in this order for every component
+    __INIT_HOOKS = {
+        'auto': ('init', 'init_auto'),
+        'teleop': ('init', 'init_teleop'),
+        'disabled': ('init', 'init_disabled')
+    }
+    __UPDATE_HOOKS = {
+        'auto': ('update', 'update_auto'),
+        'teleop': ('update', 'update_teleop'),
+        'disabled': ('update_disabled',)
+    }
+
     def __init__(self):
         super().__init__()
 
         RobotBase.__INSTANCE__ = self
         self.__components: Dict[str, Component] = {}
+
+        self.__init_dispatch: Dict[str, list] = {}
+        self.__update_dispatch: Dict[str, list] = {}
+        self.__profiled_dispatch: Dict[str, list] = {}
+        self.__compile_dispatch__()
         self.__auto_manager = AutonomousManager()
         self.__current_auto: str = None
 
+        # Autonomous selected by code, used instead of the dashboard selector when set (ex: headless simulation)
+        self.__autos = {}
+        self.__selected_auto: str = None
+
         self.__auto_selector = wpilib.SendableChooser()
         self.add_auto('none', None)
 
@@ -55,33 +79,40 @@ class RobotBase(wpilib.TimedRobot):
         Input.do_coroutine()
 
     def autonomousInit(self):
-        self.__auto_manager.start_auto(self.__auto_selector.getSelected())
-        self.__component_init__(lambda comp: comp.init_teleop())
+        if self.__selected_auto is not None:
+            self.__auto_manager.start_auto(self.__autos[self.__selected_auto])
+        else:
+            self.__auto_manager.start_auto(self.__auto_selector.getSelected())
+        self.__component_init__('auto')
 
     def autonomousPeriodic(self):
-        self.__component_update__(lambda comp: comp.update_auto())
+        self.__component_update__('auto')
 
     def autonomousExit(self) -> None:
         self.__auto_manager.end_auto()
 
     def teleopInit(self):
-        self.__component_init__(lambda comp: comp.init_teleop())
+        self.__component_init__('teleop')
 
     def teleopPeriodic(self):
-        self.__component_update__(lambda comp: comp.update_teleop())
+        self.__component_update__('teleop')
 
     def testInit(self):
         pass
 
     def testPeriodic(self):
-        pass
+        Timer.begin_loop()
 
     def disabledInit(self):
-        self.__component_init__(lambda comp: comp.init_disabled())
+        self.__component_init__('disabled')
 
     def disabledPeriodic(self):
-        for comp in self.__components.values():
-            comp.update_disabled()
+        Timer.begin_loop()
+        MotorStatusBus.refresh()
+
+        for updates in self.__update_dispatch['disabled']:
+            for update in updates:
+                update()
 
         Timer.do_allways_coroutines()
 
@@ -95,39 +126,105 @@ class RobotBase(wpilib.TimedRobot):
         self.__components[name] = component
         wpilib.SmartDashboard.putData(name, component)
 
+        self.__compile_dispatch__()
+
     def get_component(self, name: str):
         return self.__components[name]
 
-    def __component_init__(self, action):
-        for name, comp in self.__components.items():
-            comp.init()
-            if action is not None:
-                action(comp)
+    def __compile_dispatch__(self):
+        # Flat lists of the bound hooks to call in each mode, the hooks a component does not override are skipped
+        def compile_hooks(comp: Component, hooks) -> list:
+            return [getattr(comp, hook) for hook in hooks if getattr(type(comp), hook) is not getattr(Component, hook)]
+
+        components = self.__components.items()
+
+        self.__init_dispatch = {mode: [m for _, comp in components for m in compile_hooks(comp, hooks)]
+                                for mode, hooks in RobotBase.__INIT_HOOKS.items()}
+        # Grouped by component, a component raising skips its remaining hooks for the loop, the other components still run
+        self.__update_dispatch = {mode: [updates for updates in (compile_hooks(comp, hooks) for _, comp in components) if updates]
+                                  for mode, hooks in RobotBase.__UPDATE_HOOKS.items()}
+
+        # The profiled loop times every component, so its hooks are kept grouped by component
+        self.__profiled_dispatch = {mode: [(f'components/{name}', compile_hooks(comp, hooks)) for name, comp in components]
+                                    for mode, hooks in RobotBase.__UPDATE_HOOKS.items()}
+
+    def __component_init__(self, mode: str):
+        for init in self.__init_dispatch[mode]:
+            init()
+
+    def __component_update__(self, mode: str):
+        if Profiler.is_enabled():
+            self.__component_update_profiled__(mode)
+            return
+
+        # The cached device reads start over and the motor status is read once for the whole loop, before anything uses it
+        Timer.begin_loop()
+        MotorStatusBus.refresh()
+
+        if mode == 'auto':
+            self.__auto_manager.do_coroutine()
+
+        Timer.do_early_coroutines()
+
+        for updates in self.__update_dispatch[mode]:
+            try:
+                for update in updates:
+                    update()
+            except Exception as e:
+                print(e)
+
+        Timer.do_coroutines()
+        Timer.do_late_coroutines()
+        Timer.do_allways_coroutines()
+
+    def __component_update_profiled__(self, mode: str):
+        loop_start = time.perf_counter_ns()
+
+        Timer.begin_loop()
+
+        start = time.perf_counter_ns()
+        MotorStatusBus.refresh()
+        Profiler.record('motor_status', time.perf_counter_ns() - start)
 
-    def __component_update__(self, action):
-        if wpilib.DriverStation.isAutonomous():
+        if mode == 'auto':
+            start = time.perf_counter_ns()
             self.__auto_manager.do_coroutine()
+            Profiler.record('autonomous', time.perf_counter_ns() - start)
 
         Timer.do_early_coroutines()
 
-        for name, comp in self.__components.items():
+        for channel, updates in self.__profiled_dispatch[mode]:
+            start = time.perf_counter_ns()
             try:
-                comp.update()
-                if action is not None:
-                    action(comp)
+                for update in updates:
+                    update()
             except Exception as e:
                 print(e)
+            Profiler.record(channel, time.perf_counter_ns() - start)
 
         Timer.do_coroutines()
         Timer.do_late_coroutines()
         Timer.do_allways_coroutines()
 
+        # The loop overruns when it takes more than the robot period
+        loop = Profiler.get_channel('loop')
+        loop.set_budget(self.getPeriod())
+        loop.record(time.perf_counter_ns() - loop_start)
+
     def add_auto(self, name: str, auto, default: bool = False):
+        self.__autos[name] = auto
+
         if default:
             self.__auto_selector.setDefaultOption(name, auto)
         else:
             self.__auto_selector.addOption(name, auto)
 
+    def select_auto(self, name: str):
+        if name is not None and name not in self.__autos:
+            raise KeyError(f'Autonomous "{name}" does not exist.')
+
+        self.__selected_auto = name
+
     def add_logger(self, logger):
         self.__loggers.append(logger)
 
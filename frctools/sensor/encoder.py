@@ -1,4 +1,5 @@
 from frctools.frcmath import repeat
+from frctools.timer import FrameCache
 
 
 class Encoder:
@@ -7,12 +8,15 @@ class Encoder:
         self.__offset = offset
         self.__reversed = reversed
 
-    def get(self):
-        val = self.__encoder.get() - self.__offset
+        # The raw value is read once per loop, pass fresh=True to read the encoder again
+        self.__raw = FrameCache(encoder.get)
+
+    def get(self, fresh: bool = False):
+        val = self.get_raw(fresh) - self.__offset
         if self.__reversed:
             val = 1 - val
 
         return repeat(val, 1)
 
-    def get_raw(self):
-        return self.__encoder.get()
+    def get_raw(self, fresh: bool = False):
+        return self.__raw.get_fresh() if fresh else self.__raw.get()
@@ -0,0 +1,149 @@
+from .timer import Timer
+from .clock import SimulationClock
+from .input import Input
+from .robot import RobotBase
+
+from typing import Callable, Dict, Type, Union
+
+import wpilib
+import wpilib.simulation
+
+
+class RobotRunner:
+    # Runs a RobotBase through its modes in a tight loop on a SimulationClock, without the 20 ms notifier of TimedRobot.
+    # A loop only costs the robot code, so a full match runs in a fraction of its real duration.
+    AUTONOMOUS_TIME = 15.
+    TELEOP_TIME = 135.
+
+    DISABLED = 'disabled'
+    AUTONOMOUS = 'autonomous'
+    TELEOP = 'teleop'
+    TEST = 'test'
+
+    def __init__(self, robot: Union[RobotBase, Type[RobotBase]], clock: SimulationClock = None):
+        self.clock = SimulationClock() if clock is None else clock
+        Timer.set_clock(self.clock)
+
+        self.robot = robot() if isinstance(robot, type) else robot
+
+        # Scripted inputs, a value or a function of the time since the start of the current mode
+        self.__inputs: Dict[Input, Union[bool, float, Callable[[float], Union[bool, float]]]] = {}
+
+        self.__mode: str = None
+        self.__mode_start = 0.
+        self.__mode_duration = 0.
+
+        self.__loop_count = 0
+
+        self.robot.robotInit()
+
+    def set_input(self, name: str, value: Union[bool, float, Callable[[float], Union[bool, float]]]):
+        self.__inputs[Input.get_input(name)] = value
+
+    def clear_input(self, name: str):
+        self.__inputs.pop(Input.get_input(name), None)
+
+    def clear_inputs(self):
+        self.__inputs.clear()
+
+    def get_mode(self) -> str:
+        return self.__mode
+
+    def get_mode_time(self) -> float:
+        return self.clock.get_time() - self.__mode_start
+
+    def get_loop_count(self) -> int:
+        return self.__loop_count
+
+    def run_autonomous(self, duration: float = AUTONOMOUS_TIME, auto: str = None):
+        if auto is not None:
+            self.robot.select_auto(auto)
+
+        self.run(RobotRunner.AUTONOMOUS, duration)
+
+    def run_teleop(self, duration: float = TELEOP_TIME):
+        self.run(RobotRunner.TELEOP, duration)
+
+    def run_disabled(self, duration: float):
+        self.run(RobotRunner.DISABLED, duration)
+
+    def run_test(self, duration: float):
+        self.run(RobotRunner.TEST, duration)
+
+    def run_match(self, auto: str = None, autonomous_time: float = AUTONOMOUS_TIME, teleop_time: float = TELEOP_TIME):
+        self.run_disabled(self.clock.step_size)
+        self.run_autonomous(autonomous_time, auto)
+        self.run_disabled(self.clock.step_size)
+        self.run_teleop(teleop_time)
+        self.run_disabled(self.clock.step_size)
+
+    def run(self, mode: str, duration: float):
+        self.__set_mode__(mode, duration)
+
+        # Counted in loops so the number of iterations does not depend on floating point rounding
+        for _ in range(round(duration / self.clock.step_size)):
+            self.step()
+
+    def step(self):
+        time = self.get_mode_time()
+
+        wpilib.simulation.DriverStationSim.setMatchTime(max(self.__mode_duration - time, 0.))
+        wpilib.simulation.DriverStationSim.notifyNewData()
+
+        for inp, value in self.__inputs.items():
+            inp.override(value(time) if callable(value) else value)
+
+        # Same order as the loop of TimedRobot, the mode periodic runs before robotPeriodic
+        robot = self.robot
+        if self.__mode == RobotRunner.AUTONOMOUS:
+            robot.autonomousPeriodic()
+        elif self.__mode == RobotRunner.TELEOP:
+            robot.teleopPeriodic()
+        elif self.__mode == RobotRunner.TEST:
+            robot.testPeriodic()
+        else:
+            robot.disabledPeriodic()
+        robot.robotPeriodic()
+
+        self.__loop_count += 1
+        self.clock.step()
+
+    def __set_mode__(self, mode: str, duration: float):
+        if mode == self.__mode:
+            self.__mode_duration = duration
+            self.__mode_start = self.clock.get_time()
+            return
+
+        robot = self.robot
+        if self.__mode == RobotRunner.AUTONOMOUS:
+            robot.autonomousExit()
+        elif self.__mode == RobotRunner.TELEOP:
+            robot.teleopExit()
+        elif self.__mode == RobotRunner.TEST:
+            robot.testExit()
+        elif self.__mode == RobotRunner.DISABLED:
+            robot.disabledExit()
+
+        self.__mode = mode
+        self.__mode_duration = duration
+        self.__mode_start = self.clock.get_time()
+
+        # Joysticks used by the inputs are plugged in the simulation so reading them does not print warnings
+        for joystick_id in Input.__joysticks__:
+            wpilib.simulation.DriverStationSim.setJoystickAxisCount(joystick_id, 12)
+            wpilib.simulation.DriverStationSim.setJoystickButtonCount(joystick_id, 32)
+            wpilib.simulation.DriverStationSim.setJoystickPOVCount(joystick_id, 1)
+
+        wpilib.simulation.DriverStationSim.setEnabled(mode != RobotRunner.DISABLED)
+        wpilib.simulation.DriverStationSim.setAutonomous(mode == RobotRunner.AUTONOMOUS)
+        wpilib.simulation.DriverStationSim.setTest(mode == RobotRunner.TEST)
+        wpilib.simulation.DriverStationSim.notifyNewData()
+
+        if mode == RobotRunner.AUTONOMOUS:
+            robot.autonomousInit()
+        elif mode == RobotRunner.TELEOP:
+            robot.teleopInit()
+        elif mode == RobotRunner.TEST:
+            robot.testInit()
+        else:
+            robot.disabledInit()
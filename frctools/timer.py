@@ -1,5 +1,9 @@
 from enum import Enum, IntFlag
 from typing import List
+from heapq import heappush, heappop
+from itertools import count
+
+from .clock import Clock, MonotonicClock
 
 import time
 import wpilib
@@ -12,6 +16,23 @@ class CoroutineOrder(int, Enum):
     ALLWAYS = 3
 
 
+class CoroutineSleep:
+    # Yielded by a coroutine that has nothing to do until a time or a frame, the scheduler parks it until then
+    __slots__ = ('wake_time', 'wake_frame')
+
+    def __init__(self, wake_time: float = None, wake_frame: int = None):
+        self.wake_time = wake_time
+        self.wake_frame = wake_frame
+
+    def is_due(self) -> bool:
+        if self.wake_time is not None and Timer.get_current_time() < self.wake_time:
+            return False
+        if self.wake_frame is not None and Timer.get_frame_count() < self.wake_frame:
+            return False
+
+        return True
+
+
 class Coroutine:
     def __init__(self, generator, order, ignore_stop_all=False):
         self.__generator = generator
@@ -20,11 +41,35 @@ class Coroutine:
         self.is_done = False
         self.ignore_stop_all = ignore_stop_all
 
-    def do_coroutine(self):
+        # Slot and generation of the coroutine in the scheduler, -1 when not scheduled
+        self.slot = -1
+        self.generation = 0
+
+        self.sleep: CoroutineSleep = None
+
+        # Name and profiler channel, only used when the profiler is enabled
+        self.name = getattr(generator, '__qualname__', type(generator).__name__)
+        self.profile_channel = None
+
+    def do_coroutine(self) -> CoroutineSleep:
+        # Returns the sleep the coroutine is waiting on, if any
+        sleep = self.sleep
+        if sleep is not None:
+            if not sleep.is_due():
+                return sleep
+            self.sleep = None
+
         try:
-            next(self.__generator)
+            value = next(self.__generator)
         except StopIteration:
             self.is_done = True
+            return None
+
+        if value is not None and isinstance(value, CoroutineSleep):
+            self.sleep = value
+            return value
+
+        return None
 
     def wait(self):
         while not self.is_done:
@@ -34,6 +79,145 @@ class Coroutine:
         yield from self.__generator
 
 
+class CoroutineScheduler:
+    # Every stage is a list of slots, a coroutine is added in a free slot and removed by emptying its slot, both in O(1).
+    # The generation of a slot is incremented when it is emptied, so a stale coroutine cannot remove the one reusing it.
+    # A sleeping coroutine leaves its slot for a min-heap keyed on its wake time or frame and costs nothing until due.
+    def __init__(self, stage_count: int):
+        self.__slots: List[List[Coroutine]] = [[] for _ in range(stage_count)]
+        self.__generations: List[List[int]] = [[] for _ in range(stage_count)]
+        self.__free: List[List[int]] = [[] for _ in range(stage_count)]
+
+        self.__time_heaps: List[list] = [[] for _ in range(stage_count)]
+        self.__frame_heaps: List[list] = [[] for _ in range(stage_count)]
+        self.__sequence = count()
+
+        # Receives the duration of every coroutine step when set, see frctools.Profiler
+        self.profiler = None
+
+    def add(self, coroutine: Coroutine) -> Coroutine:
+        stage = coroutine.order
+        slots = self.__slots[stage]
+        free = self.__free[stage]
+
+        if free:
+            slot = free.pop()
+            slots[slot] = coroutine
+        else:
+            slot = len(slots)
+            slots.append(coroutine)
+            self.__generations[stage].append(0)
+
+        coroutine.slot = slot
+        coroutine.generation = self.__generations[stage][slot]
+
+        return coroutine
+
+    def remove(self, coroutine: Coroutine) -> bool:
+        stage = coroutine.order
+        slot = coroutine.slot
+
+        if slot < 0 or self.__generations[stage][slot] != coroutine.generation:
+            return False
+
+        self.__slots[stage][slot] = None
+        self.__generations[stage][slot] += 1
+        self.__free[stage].append(slot)
+
+        coroutine.slot = -1
+        return True
+
+    def run(self, stage: int):
+        self.__wake__(stage)
+
+        profiler = self.profiler
+
+        # The slot list never shrinks, so coroutines can be added or removed while the stage runs
+        for cor in self.__slots[stage]:
+            if cor is None:
+                continue
+
+            if profiler is not None:
+                start = time.perf_counter_ns()
+
+            try:
+                if cor.do_coroutine() is not None:
+                    self.remove(cor)
+                    self.__park__(cor)
+                    continue
+            except Exception as e:
+                # A failing coroutine is stopped without affecting the others
+                print(e)
+                cor.is_done = True
+            finally:
+                if profiler is not None:
+                    profiler.record_coroutine(cor, time.perf_counter_ns() - start)
+
+            if cor.is_done:
+                self.remove(cor)
+
+        # Once mostly empty, the slots are packed so the loop does not walk over the holes left by sleeping coroutines
+        free = self.__free[stage]
+        if len(free) > 16 and len(free) * 2 > len(self.__slots[stage]):
+            self.__compact__(stage)
+
+    def clear(self, force: bool = False):
+        for slots in self.__slots:
+            for cor in slots:
+                if cor is not None and (force or not cor.ignore_stop_all):
+                    cor.is_done = True
+                    self.remove(cor)
+
+        for heap in self.__time_heaps + self.__frame_heaps:
+            for _, _, cor in heap:
+                if force or not cor.ignore_stop_all:
+                    cor.is_done = True
+
+    def get_count(self, stage: int) -> int:
+        return len(self.__slots[stage]) - len(self.__free[stage]) + self.get_sleeping_count(stage)
+
+    def get_sleeping_count(self, stage: int) -> int:
+        return sum(not cor.is_done for heap in (self.__time_heaps[stage], self.__frame_heaps[stage]) for _, _, cor in heap)
+
+    def __compact__(self, stage: int):
+        slots = [cor for cor in self.__slots[stage] if cor is not None]
+        for slot, cor in enumerate(slots):
+            cor.slot = slot
+
+        self.__slots[stage] = slots
+        self.__generations[stage] = [cor.generation for cor in slots]
+        self.__free[stage] = []
+
+    def __park__(self, coroutine: Coroutine):
+        sleep = coroutine.sleep
+        if sleep.wake_time is not None and Timer.get_current_time() < sleep.wake_time:
+            heappush(self.__time_heaps[coroutine.order], (sleep.wake_time, next(self.__sequence), coroutine))
+        elif sleep.wake_frame is not None and Timer.get_frame_count() < sleep.wake_frame:
+            heappush(self.__frame_heaps[coroutine.order], (sleep.wake_frame, next(self.__sequence), coroutine))
+        else:
+            self.add(coroutine)
+
+    def __wake__(self, stage: int):
+        # Stopped coroutines are only marked as done, they are dropped here when they come out of the heap
+        heap = self.__time_heaps[stage]
+        if heap:
+            now = Timer.get_current_time()
+            while heap and heap[0][0] <= now:
+                cor = heappop(heap)[2]
+                if not cor.is_done:
+                    self.__park__(cor)
+
+        # Checked after the time heap, a sleep waiting on both is moved to the frame heap once its time is reached
+        heap = self.__frame_heaps[stage]
+        if heap:
+            frame = Timer.get_frame_count()
+            while heap and heap[0][0] <= frame:
+                cor = heappop(heap)[2]
+                if not cor.is_done:
+                    self.__park__(cor)
+
+
+
 class Period(IntFlag):
     NONE =              0b00000000
 
@@ -109,11 +293,21 @@ class Timer:
     __DT = 0.
     __FRAME_COUNT = 0
 
-    __EARLY_COROUTINES: List['Coroutine'] = []
-    __NORMAL_COROUTINES: List['Coroutine'] = []
-    __LATE_COROUTINE: List['Coroutine'] = []
+    # Key of the per-loop caches (FrameCache), unlike the frame count it is never reset
+    __LOOP_ID = 0
+
+    __SCHEDULER = CoroutineScheduler(len(CoroutineOrder))
 
-    __ALLWAYS_COROUTINES: List['Coroutine'] = []
+    __CLOCK: Clock = MonotonicClock()
+
+    @staticmethod
+    def set_clock(clock: Clock):
+        # Should be set before init, the start time and the sleeping coroutines are in the time base of the clock
+        Timer.__CLOCK = clock
+
+    @staticmethod
+    def get_clock() -> Clock:
+        return Timer.__CLOCK
 
     @staticmethod
     def init():
@@ -138,21 +332,21 @@ class Timer:
         Timer.__LAST_TIME = curr
 
         Timer.__FRAME_COUNT += 1
+        Timer.__LOOP_ID += 1
 
     @staticmethod
-    def start_coroutine(coroutine, order: CoroutineOrder = CoroutineOrder.NORMAL, ignore_stop_all: bool = False) -> Coroutine:
-        cor = Coroutine(coroutine, order, ignore_stop_all)
+    def begin_loop():
+        # Called by the robot before anything reads a device. The values cached after evaluate (e.g. by the dashboard)
+        # are not reused by the next loop.
+        Timer.__LOOP_ID += 1
 
-        if order == CoroutineOrder.EARLY:
-            Timer.__EARLY_COROUTINES.append(cor)
-        elif order == CoroutineOrder.NORMAL:
-            Timer.__NORMAL_COROUTINES.append(cor)
-        elif order == CoroutineOrder.LATE:
-            Timer.__LATE_COROUTINE.append(cor)
-        elif order == CoroutineOrder.ALLWAYS:
-            Timer.__ALLWAYS_COROUTINES.append(cor)
+    @staticmethod
+    def get_loop_id() -> int:
+        return Timer.__LOOP_ID
 
-        return cor
+    @staticmethod
+    def start_coroutine(coroutine, order: CoroutineOrder = CoroutineOrder.NORMAL, ignore_stop_all: bool = False) -> Coroutine:
+        return Timer.__SCHEDULER.add(Coroutine(coroutine, order, ignore_stop_all))
 
     @staticmethod
     def start_coroutine_if_stopped(coroutine, ref_coroutine: Coroutine, order: CoroutineOrder = CoroutineOrder.NORMAL, ignore_stop_all: bool = False) -> Coroutine:
@@ -163,64 +357,39 @@ class Timer:
 
     @staticmethod
     def stop_coroutine(coroutine: Coroutine):
-        if coroutine.order == CoroutineOrder.EARLY:
-            Timer.__EARLY_COROUTINES.remove(coroutine)
-        elif coroutine.order == CoroutineOrder.NORMAL:
-            Timer.__NORMAL_COROUTINES.remove(coroutine)
-        elif coroutine.order == CoroutineOrder.LATE:
-            Timer.__LATE_COROUTINE.remove(coroutine)
-        elif coroutine.order == CoroutineOrder.ALLWAYS:
-            Timer.__ALLWAYS_COROUTINES.remove(coroutine)
-
+        Timer.__SCHEDULER.remove(coroutine)
         coroutine.is_done = True
 
     @staticmethod
     def stop_all_coroutine():
-        for cor in Timer.__EARLY_COROUTINES:
-            if not cor.ignore_stop_all:
-                cor.is_done = True
-                Timer.__EARLY_COROUTINES.remove(cor)
-
-        for cor in Timer.__NORMAL_COROUTINES:
-            if not cor.ignore_stop_all:
-                cor.is_done = True
-                Timer.__NORMAL_COROUTINES.remove(cor)
+        Timer.__SCHEDULER.clear()
 
-        for cor in Timer.__LATE_COROUTINE:
-            if not cor.ignore_stop_all:
-                cor.is_done = True
-                Timer.__LATE_COROUTINE.remove(cor)
-
-        for cor in Timer.__ALLWAYS_COROUTINES:
-            if not cor.ignore_stop_all:
-                cor.is_done = True
-                Timer.__ALLWAYS_COROUTINES.remove(cor)
+    @staticmethod
+    def set_profiler(profiler):
+        Timer.__SCHEDULER.profiler = profiler
 
     @staticmethod
-    def __do_coroutines__(coroutines: List[Coroutine]):
-        try:
-            for cor in coroutines:
-                cor.do_coroutine()
-                if cor.is_done:
-                    coroutines.remove(cor)
-        except Exception as e:
-            print(e)
+    def get_coroutine_count(order: CoroutineOrder = None) -> int:
+        if order is None:
+            return sum(Timer.__SCHEDULER.get_count(o) for o in CoroutineOrder)
+
+        return Timer.__SCHEDULER.get_count(order)
 
     @staticmethod
     def do_early_coroutines():
-        Timer.__do_coroutines__(Timer.__EARLY_COROUTINES)
+        Timer.__SCHEDULER.run(CoroutineOrder.EARLY)
 
     @staticmethod
     def do_coroutines():
-        Timer.__do_coroutines__(Timer.__NORMAL_COROUTINES)
+        Timer.__SCHEDULER.run(CoroutineOrder.NORMAL)
 
     @staticmethod
     def do_late_coroutines():
-        Timer.__do_coroutines__(Timer.__LATE_COROUTINE)
+        Timer.__SCHEDULER.run(CoroutineOrder.LATE)
 
     @staticmethod
     def do_allways_coroutines():
-        Timer.__do_coroutines__(Timer.__ALLWAYS_COROUTINES)
+        Timer.__SCHEDULER.run(CoroutineOrder.ALLWAYS)
 
     @staticmethod
     def get_period() -> Period:
@@ -261,7 +430,7 @@ class Timer:
 
     @staticmethod
     def get_current_time():
-        return time.time_ns() / 1e9
+        return Timer.__CLOCK.get_time()
 
     @staticmethod
     def get_time_since_start():
@@ -281,21 +450,18 @@ class Timer:
 
     @staticmethod
     def wait_for_frame(frame: int):
-        if frame <= 0:
-            yield from ()
-
-        start_frame = Timer.get_frame_count()
-        while Timer.get_elapsed_frame(start_frame) < frame:
-            yield None
+        yield from Timer.sleep(wake_frame=Timer.get_frame_count() + frame)
 
     @staticmethod
     def wait_for_seconds(seconds: float):
-        if seconds <= 0.:
-            yield from ()
+        yield from Timer.sleep(wake_time=Timer.get_current_time() + seconds)
 
-        start_time = Timer.get_current_time()
-        while Timer.get_elapsed(start_time) < seconds:
-            yield None
+    @staticmethod
+    def sleep(wake_time: float = None, wake_frame: int = None):
+        # Parked by the scheduler until due, the loop only matters when driven by something else (ex: wait_parallel)
+        sleep = CoroutineSleep(wake_time, wake_frame)
+        while not sleep.is_due():
+            yield sleep
 
     @staticmethod
     def wait_parallel(*coroutines):
@@ -315,3 +481,32 @@ class Timer:
 
             if still_running:
                 yield None
+
+
+class FrameCache:
+    # Keeps the value read from a device for the rest of the loop, only the first read of a loop reaches the device.
+    # Keyed on Timer.get_loop_id, which advances at the start of every robot loop and survives Timer.reset.
+    __slots__ = ('__read', '__loop', '__value')
+
+    def __init__(self, read):
+        self.__read = read
+        self.__loop = -1
+        self.__value = None
+
+    def get(self):
+        loop = Timer.get_loop_id()
+        if loop != self.__loop:
+            self.__value = self.__read()
+            self.__loop = loop
+
+        return self.__value
+
+    def get_fresh(self):
+        # Reads the device even if it was already read this loop, the new value is kept for the rest of the loop
+        self.__value = self.__read()
+        self.__loop = Timer.get_loop_id()
+
+        return self.__value
+
+    def invalidate(self):
+        self.__loop = -1
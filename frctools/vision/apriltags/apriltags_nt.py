@@ -1,7 +1,10 @@
 from ntcore import NetworkTableInstance, NetworkTableEntry, Event, EventFlags
 
+from frctools import Timer
 from frctools.frcmath import Vector2, Vector3, Quaternion
 
+import ntcore
+
 
 class AprilTagEntry:
     def __init__(self, id: int, nt_instance: NetworkTableInstance):
@@ -16,6 +19,7 @@ class AprilTagEntry:
 
         self.__position_entry: NetworkTableEntry = nt_instance.getEntry(f'{parent_path}/position')
         self.__position = Vector3.from_list(self.__position_entry.getDoubleArray([0, 0, 0]))
+        self.__timestamp = Timer.get_current_time()
         nt_instance.addListener(self.__position_entry, EventFlags.kValueAll, self.__on_pos_update__)
 
         self.__rotation_entry: NetworkTableEntry = nt_instance.getEntry(f'{parent_path}/rotation')
@@ -38,6 +42,9 @@ class AprilTagEntry:
 
     def get_position(self):
         return self.__position
+    def get_timestamp(self) -> float:
+        # Time of the last position in the time base of Timer, for latency compensation (ex: SwerveOdometry)
+        return self.__timestamp
     def set_position(self, position):
         self.__position_entry.setDoubleArray([position[0], position[1], position[2]])
 
@@ -60,6 +67,9 @@ class AprilTagEntry:
         self.__cam_id = event.data.value.getInteger()
     def __on_pos_update__(self, event: Event):
         self.__position = Vector3.from_list(event.data.value.getDoubleArray())
+
+        # The value time is in NetworkTables microseconds, only its age is carried over to the Timer clock
+        self.__timestamp = Timer.get_current_time() - (ntcore._now() - event.data.value.time()) / 1e6
     def __on_rot_update__(self, event: Event):
         self.__rotation = Quaternion.from_list(event.data.value.getDoubleArray())
     def __on_center_update__(self, event: Event):
@@ -0,0 +1,66 @@
+import wpilib.simulation
+
+from frctools import Component, RobotBase, RobotRunner
+from frctools.input import Input
+
+
+class AxisLogger(Component):
+    def __init__(self):
+        super().__init__()
+        self.values = []
+
+    def update_teleop(self):
+        self.values.append(Input.get_input('drive').get())
+
+
+class RecordingRobot(RobotBase):
+    def robotInit(self):
+        super().robotInit()
+
+        Input.add_axis('drive', 0, 'axis.1')
+
+        self.logger = AxisLogger()
+        self.add_component('logger', self.logger)
+
+
+def drive_steps(runner: RobotRunner, count: int, offset: int = 0):
+    for i in range(count):
+        wpilib.simulation.DriverStationSim.setJoystickAxis(0, 1, ((i + offset) % 20) / 20)
+        runner.step()
+
+
+def test_recording_across_disabled_to_teleop(tmp_path):
+    path = str(tmp_path / 'inputs.bin')
+
+    runner = RobotRunner(RecordingRobot)
+    logger = runner.robot.logger
+
+    # Started while disabled, Timer.reset runs when the robot leaves disabled
+    runner.run_disabled(0.2)
+    Input.start_recording(path)
+    drive_steps(runner, 5)
+
+    runner.run_teleop(0.)
+    drive_steps(runner, 30, 5)
+    Input.stop_recording()
+
+    recorded = logger.values[:]
+    assert len(recorded) == 30
+    assert len(set(recorded)) > 1
+
+    # Replayed along the same transition, the live joystick is ignored
+    runner.run_disabled(0.2)
+    logger.values.clear()
+
+    Input.start_replay(path)
+    wpilib.simulation.DriverStationSim.setJoystickAxis(0, 1, 0.)
+    for _ in range(5):
+        runner.step()
+
+    runner.run_teleop(0.)
+    for _ in range(30):
+        runner.step()
+
+    assert logger.values == recorded
+
+    Input.stop_replay()
@@ -0,0 +1,24 @@
+from frctools.controll.path_planning import PathPlanning, PathPlanningPoint
+from frctools.frcmath import Vector2
+
+
+def test_in_place_edits_do_not_leave_the_path_stale():
+    start = Vector2(0., 0.)
+
+    path = PathPlanning()
+    point = PathPlanningPoint(start, 0., 0.)
+    path.add_point(point)
+    path.add_point(PathPlanningPoint(Vector2(2., 0.), 0., 2.))
+
+    before = path.get_state_at(1.)[0].to_tuple()
+
+    # Editing the vectors in place must not reach the points, only an assignment does
+    start.x = 10.
+    point.position.x = 10.
+    path.get_bezier(0)[2].y = 5.
+    assert path.get_state_at(1.)[0].to_tuple() == before
+
+    position = point.position
+    position.x = 1.
+    point.position = position
+    assert path.get_state_at(1.)[0].x > before[0]
@@ -0,0 +1,104 @@
+import math
+import tracemalloc
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from frctools.drivetrain.kinematics import SwerveKinematics
+from frctools.drivetrain.setpoint import SwerveSetpointGenerator
+from frctools.drivetrain.swerve import SwerveModule
+from frctools.frcmath import Vector2
+
+
+# Loop iterators are the only objects a steady-state call may create, a list or a numpy temporary is larger
+TRANSIENT_BUDGET = 256
+
+POSITIONS = [Vector2(0.3, 0.3), Vector2(-0.3, 0.3), Vector2(-0.3, -0.3), Vector2(0.3, -0.3)]
+
+
+class FakeMotor:
+    def __init__(self):
+        self.value = 0.
+
+    def set(self, value: float):
+        self.value = value
+
+    def get(self) -> float:
+        return self.value
+
+
+class FakeEncoder:
+    def get(self) -> float:
+        return 0.3
+
+
+class FakeController:
+    def evaluate(self, error: float) -> float:
+        return error
+
+
+def measure(fn, calls: int = 200):
+    # Returns the largest transient allocation of a single call and the memory kept after every call
+    for _ in range(10):
+        fn()
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+
+        worst = 0
+        for _ in range(calls):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            fn()
+            worst = max(worst, tracemalloc.get_traced_memory()[1] - before)
+
+        kept = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+
+    return worst, kept
+
+
+def test_kinematics_compute_allocation_free():
+    kinematics = SwerveKinematics(POSITIONS)
+    translation = Vector2(0.8, 0.9)
+
+    angles, speeds = kinematics.compute(translation, 0.7)
+    assert max(speeds) == pytest.approx(1.)
+
+    worst, kept = measure(lambda: kinematics.compute(translation, 0.7))
+    assert worst <= TRANSIENT_BUDGET
+    assert kept <= 0
+
+    # The same buffers are returned on every call
+    assert kinematics.compute(translation, 0.7) == (angles, speeds)
+    assert kinematics.compute(translation, 0.7)[0] is angles
+
+
+def test_setpoint_generator_allocation_free():
+    kinematics = SwerveKinematics(POSITIONS)
+    generator = SwerveSetpointGenerator(max_steering_rate=10., max_drive_acceleration=3.)
+    generator.reset([0.] * len(POSITIONS))
+
+    angles, speeds = kinematics.compute(Vector2(0.5, 0.3), 0.8)
+
+    worst, kept = measure(lambda: generator.generate(angles, speeds, 0.02))
+    assert worst <= TRANSIENT_BUDGET
+    assert kept <= 0
+
+    assert generator.generate(angles, speeds, 0.02)[1] is generator.get_drives()
+
+
+def test_swerve_module_update_allocation_free():
+    module = SwerveModule(FakeMotor(), FakeMotor(), FakeEncoder(), FakeController(), 0., POSITIONS[0])
+    translation = Vector2(0.4, -0.2)
+
+    def update():
+        module.update(translation, 0.5)
+        module.set_target(math.pi / 4, 0.6)
+
+    worst, kept = measure(update)
+    assert worst <= TRANSIENT_BUDGET
+    assert kept <= 0